@@ -6,7 +6,7 @@ Manual join only, no calendar polling or scheduling.
 import asyncio
 import uuid
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
 
 from app.config import settings, get_logger
 from app.meeting_handler import MeetingJoiner
@@ -25,9 +25,13 @@ class MeetingBot:
     
     def __init__(self):
         """Initialize the Meeting Bot."""
-        self.meeting_joiner: Optional[MeetingJoiner] = None
+        # Created eagerly (no browser yet); the browser launches on start()
+        self.meeting_joiner = MeetingJoiner(on_meeting_finished=self._on_meeting_finished)
         self._initialized = False
         self.active_sessions: Dict[str, MeetingSession] = {}
+        self._sessions_by_url: Dict[str, str] = {}  # meeting_url -> meeting_id
+        # Strong references to background join tasks; discarded when they finish
+        self._background_tasks: Set[asyncio.Task] = set()
         self._shutdown_event = asyncio.Event()
     
     async def initialize(self) -> bool:
@@ -37,22 +41,56 @@ class MeetingBot:
         
         logger.info("Initializing Meeting Bot...")
         
-        # Initialize meeting joiner
-        self.meeting_joiner = MeetingJoiner()
+        # Launch the meeting joiner's browser
         await self.meeting_joiner.start()
         
         logger.info("Meeting Bot initialized successfully")
         self._initialized = True
         return True
     
+    def get_active_session(self, meeting_url: str) -> Optional[MeetingSession]:
+        """
+        Look up the session currently joining or attending a meeting URL.
+        
+        Args:
+            meeting_url: Meeting URL as passed to manual_join_meeting
+            
+        Returns:
+            The live session, or None if the bot is not in that meeting
+        """
+        meeting_id = self._sessions_by_url.get(meeting_url)
+        if meeting_id is None:
+            return None
+        session = self.active_sessions.get(meeting_id)
+        if session is None or not self._is_live(session):
+            return None
+        return session
+    
+    @staticmethod
+    def _is_live(session: MeetingSession) -> bool:
+        """A session is live while its meeting is joining/joined and not yet cleaned up."""
+        meeting = session.meeting
+        return meeting.is_joined and not meeting.is_completed
+    
+    def _on_meeting_finished(self, meeting: MeetingDetails) -> None:
+        """End the session of a meeting the joiner is done with (left, failed or skipped)."""
+        session = self.active_sessions.get(meeting.meeting_id)
+        if session is not None:
+            self._end_session(session)
+    
+    def _end_session(self, session: MeetingSession) -> None:
+        """Mark a session ended and drop it from both indexes."""
+        session.ended_at = datetime.now(settings.tz_info)
+        meeting = session.meeting
+        self.active_sessions.pop(meeting.meeting_id, None)
+        if self._sessions_by_url.get(meeting.meeting_url) == meeting.meeting_id:
+            del self._sessions_by_url[meeting.meeting_url]
+    
     async def manual_join_meeting(
         self, 
         bot_name: str, 
         meeting_url: str,
-        s3_bucket_name: str = None, 
-        aws_access_key_id: str = None,
-        aws_secret_access_key: str = None, 
-        aws_region: str = None,
+        s3_config: Optional[dict] = None,
         caption_language: str = "English"
     ) -> dict:
         """
@@ -61,10 +99,8 @@ class MeetingBot:
         Args:
             bot_name: Display name for the bot
             meeting_url: Meeting URL (Google Meet, Teams, or Zoom)
-            s3_bucket_name: Optional S3 bucket for transcript storage
-            aws_access_key_id: Optional AWS access key
-            aws_secret_access_key: Optional AWS secret key
-            aws_region: Optional AWS region
+            s3_config: Optional custom S3 destination (bucket_name, access_key_id,
+                secret_access_key, region); env-configured S3 is used when None
             caption_language: Caption language (default: English)
             
         Returns:
@@ -98,21 +134,12 @@ class MeetingBot:
                 source=MeetingSource.MANUAL,
                 organizer=bot_name,
                 description=f"Manual join by {bot_name}",
-                caption_language=caption_language
+                caption_language=caption_language,
+                s3_config=s3_config
             )
             
-            # Store S3 credentials with the meeting 
-            if s3_bucket_name and aws_access_key_id and aws_secret_access_key:
-                meeting.s3_config = {
-                    'bucket_name': s3_bucket_name,
-                    'access_key_id': aws_access_key_id,
-                    'secret_access_key': aws_secret_access_key,
-                    'region': aws_region or 'us-east-1'
-                }
-            
-            # Ensure joiner is initialized
-            if not self.meeting_joiner:
-                self.meeting_joiner = MeetingJoiner()
+            # Ensure joiner browser is running
+            if not self.meeting_joiner.is_running:
                 await self.meeting_joiner.start()
             
             # Create session
@@ -123,10 +150,13 @@ class MeetingBot:
                 started_at=now
             )
             self.active_sessions[meeting_id] = session
+            self._sessions_by_url[meeting_url] = meeting_id
             
             # Join meeting in background
             meeting.is_joined = True
-            asyncio.create_task(self.meeting_joiner.join_meeting(meeting))
+            task = asyncio.create_task(self.meeting_joiner.join_meeting(meeting))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
             
             logger.info(f"✅ Manual join initiated: {meeting.title} ({platform.value})")
             
@@ -145,10 +175,10 @@ class MeetingBot:
         """Shutdown the Meeting Bot gracefully."""
         logger.info("Shutting down Meeting Bot...")
         
-        if self.meeting_joiner:
-            await self.meeting_joiner.stop()
+        await self.meeting_joiner.stop()
         
         self.active_sessions.clear()
+        self._sessions_by_url.clear()
         logger.info("Meeting Bot shutdown complete")
     
     def get_status(self) -> dict:
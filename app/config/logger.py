@@ -12,6 +12,8 @@ from typing import Optional
 
 from .settings import settings
 
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with color support for console output."""
@@ -70,7 +72,7 @@ def setup_logging(
     console_handler.setLevel(getattr(logging, level))
     console_format = ColoredFormatter(
         fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
+        datefmt=LOG_DATE_FORMAT
     )
     console_handler.setFormatter(console_format)
     logger.addHandler(console_handler)
@@ -87,7 +89,7 @@ def setup_logging(
         file_handler.setLevel(getattr(logging, level))
         file_format = logging.Formatter(
             fmt="%(asctime)s | %(levelname)s | %(name)s | %(funcName)s:%(lineno)d | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
+            datefmt=LOG_DATE_FORMAT
         )
         file_handler.setFormatter(file_format)
         logger.addHandler(file_handler)
@@ -3,6 +3,7 @@ Configuration settings for the Meeting Bot.
 Simplified - only bot, recording, and S3 settings.
 """
 
+from functools import cached_property
 from typing import Optional, List
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -55,6 +56,37 @@ class BotSettings(BaseSettings):
     lobby_timeout_seconds: int = Field(default=600, description="Max lobby wait (seconds)")
     auto_enable_captions: bool = Field(default=True, description="Auto-enable captions")
     auto_mute_on_join: bool = Field(default=True, description="Auto-mute on join")
+    max_concurrent_joins: int = Field(
+        default=3, ge=1,
+        description="Max meetings going through the join flow at once (lobby waits count)"
+    )
+    block_assets: bool = Field(
+        default=False,
+        description="Block images/fonts/media/analytics on Teams, Meet and Zoom pages (not shown in recordings)"
+    )
+    teams_storage_state: Optional[str] = Field(
+        default=None,
+        description="Playwright storage state JSON with a signed-in Teams session"
+    )
+    context_max_age_minutes: int = Field(
+        default=120, ge=1,
+        description=(
+            "Stop handing new meetings to a shared Teams context older than this. "
+            "Only reuse is limited: a running meeting keeps its context however long it lasts"
+        )
+    )
+    google_storage_state: Optional[str] = Field(
+        default=None,
+        description="Playwright storage state JSON for the Google account; saved after auto-login"
+    )
+    context_pool_size: int = Field(
+        default=1, ge=0,
+        description="Fresh browser contexts kept ready per Meet/Zoom handler (0 disables)"
+    )
+    headless: bool = Field(
+        default=False,
+        description="Run Chromium in the new headless mode instead of a visible window"
+    )
 
 
 class Settings(BaseSettings):
@@ -95,9 +127,9 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid log level: {v}")
         return v.upper()
 
-    @property
+    @cached_property
     def tz_info(self):
-        """Get timezone info (auto-detected if 'auto')."""
+        """Get timezone info (auto-detected if 'auto'), resolved once per process."""
         if self.timezone.lower() == "auto":
             return tz.tzlocal()
         try:
@@ -0,0 +1,335 @@
+"""
+Browser Utilities
+
+Shared Playwright helpers for the platform handlers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+from app.config import get_logger
+
+
+logger = get_logger("browser_utils")
+
+
+# Static assets and telemetry the bot never looks at. Matched by URL so that
+# Playwright filters in the browser and unrelated requests never reach Python.
+BLOCKED_ASSET_PATTERN = re.compile(
+    r"\.(?:png|jpe?g|gif|webp|svg|ico|woff2?|ttf|otf|eot|mp3|mp4|webm)(?:[?#]|$)"
+    r"|google-analytics\.com|googletagmanager\.com|doubleclick\.net"
+    r"|segment\.io|mixpanel\.com|browser\.events\.data\.microsoft\.com",
+    re.IGNORECASE,
+)
+
+
+async def block_heavy_assets(context: BrowserContext) -> None:
+    """
+    Abort image, font, media and analytics requests for a browser context.
+
+    Scripts, XHR/fetch and websockets are left untouched; meeting signalling
+    depends on them.
+
+    Args:
+        context: Browser context to install the route on
+    """
+    await context.route(BLOCKED_ASSET_PATTERN, lambda route: route.abort())
+    logger.info("Blocking images, fonts, media and analytics for this context")
+
+
+# Playwright-only selector forms that document.querySelector cannot evaluate
+_TEXT_SELECTOR_RE = re.compile(r'^text="(.+)"$')
+_HAS_TEXT_SELECTOR_RE = re.compile(r'^([a-z]+):has-text\("(.+)"\)$')
+
+
+def to_dom_matcher(selectors) -> dict:
+    """
+    Convert Playwright selectors into a matcher that DOM_MATCHER_JS can evaluate.
+
+    ``text="..."`` becomes an exact text-node match and ``tag:has-text("...")``
+    a case-insensitive substring match on that tag; everything else is joined
+    into one CSS selector list.
+
+    Args:
+        selectors: Playwright selectors (CSS, text= or :has-text())
+
+    Returns:
+        Dict with ``css`` (comma-joined CSS selector) and ``texts`` entries
+    """
+    css = []
+    texts = []
+    for selector in selectors:
+        if match := _TEXT_SELECTOR_RE.match(selector):
+            texts.append({"tag": None, "text": match[1], "exact": True})
+        elif match := _HAS_TEXT_SELECTOR_RE.match(selector):
+            texts.append({"tag": match[1], "text": match[2].lower(), "exact": False})
+        else:
+            css.append(selector)
+    return {"css": ", ".join(css), "texts": texts}
+
+
+# In-page helpers for matchers built by to_dom_matcher(). Embedded at the top
+# of a function body; defines matches(matcher, visibleOnly = true).
+DOM_MATCHER_JS = """
+    const isVisible = (el) => !!el && el.getClientRects().length > 0
+        && getComputedStyle(el).visibility !== 'hidden';
+    const normalize = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+    // text="..." is exact; :has-text() is a case-insensitive substring match
+    const textMatches = (value, text, exact) =>
+        exact ? value === text : value.toLowerCase().includes(text);
+    
+    const textNodeMatches = (text, exact, visibleOnly) => {
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            if (textMatches(normalize(node.nodeValue), text, exact)
+                && (!visibleOnly || isVisible(node.parentElement))) {
+                return true;
+            }
+        }
+        return false;
+    };
+    
+    const matches = ({ css, texts }, visibleOnly = true) => {
+        if (css) {
+            // Presence alone needs only the first match, not the whole NodeList
+            if (!visibleOnly) {
+                if (document.querySelector(css)) return true;
+            } else {
+                for (const el of document.querySelectorAll(css)) {
+                    if (isVisible(el)) return true;
+                }
+            }
+        }
+        for (const { tag, text, exact } of texts) {
+            if (!tag) {
+                if (textNodeMatches(text, exact, visibleOnly)) return true;
+                continue;
+            }
+            for (const el of document.querySelectorAll(tag)) {
+                if (textMatches(normalize(el.textContent), text, exact)
+                    && (!visibleOnly || isVisible(el))) return true;
+            }
+        }
+        return false;
+    };
+"""
+
+FIRST_MATCH_JS = (
+    "({ matchers, visible }) => {"
+    + DOM_MATCHER_JS
+    + "    return matchers.findIndex((matcher) => matches(matcher, visible));\n}"
+)
+
+
+MATCH_EACH_JS = (
+    "({ matchers, visible }) => {"
+    + DOM_MATCHER_JS
+    + "    return matchers.map((matcher) => matches(matcher, visible));\n}"
+)
+
+
+async def first_match(page: Page, matchers: list[dict], visible: bool = True) -> int:
+    """
+    Probe several matchers in a single page.evaluate.
+
+    Replaces per-selector ``locator.count()`` / ``is_visible()`` loops, which
+    cost two round trips per selector.
+
+    Args:
+        page: Page to probe
+        matchers: Matchers from to_dom_matcher(), in priority order
+        visible: Require a visible match (False: any element in the DOM)
+
+    Returns:
+        Index of the first matcher with a match, or -1 if none match
+    """
+    return await page.evaluate(FIRST_MATCH_JS, {"matchers": matchers, "visible": visible})
+
+
+async def match_each(page: Page, matchers: list[dict], visible: bool = True) -> list[bool]:
+    """
+    Evaluate every matcher in a single page.evaluate.
+
+    Lets one periodic tick answer several independent questions at once.
+
+    Args:
+        page: Page to probe
+        matchers: Matchers from to_dom_matcher()
+        visible: Require a visible match (False: any element in the DOM)
+
+    Returns:
+        One boolean per matcher, in order
+    """
+    return await page.evaluate(MATCH_EACH_JS, {"matchers": matchers, "visible": visible})
+
+
+def page_closed_event(page: Page) -> asyncio.Event:
+    """
+    Create an event that is set once the page closes.
+
+    Lets polling loops wait on the close instead of checking is_closed()
+    every tick.
+
+    Args:
+        page: Page to watch
+
+    Returns:
+        Event set by the page's "close" event (already set if it is closed)
+    """
+    closed = asyncio.Event()
+    if page.is_closed():
+        closed.set()
+    else:
+        page.on("close", lambda _: closed.set())
+    return closed
+
+
+async def sleep_unless_closed(closed: asyncio.Event, seconds: float) -> bool:
+    """
+    Sleep between polls, waking immediately if the page closes.
+
+    Args:
+        closed: Event from page_closed_event()
+        seconds: Poll interval
+
+    Returns:
+        True if the page closed (the caller should stop), False on timeout
+    """
+    try:
+        await asyncio.wait_for(closed.wait(), timeout=seconds)
+        return True
+    except TimeoutError:
+        return False
+
+
+async def release_meeting(
+    active_contexts: dict[str, BrowserContext],
+    meeting_url: str,
+    context: BrowserContext,
+    page: Optional[Page] = None,
+) -> None:
+    """
+    Close a meeting's page, and its context once no other page uses it.
+
+    The single teardown path for handlers and the orchestrator. The close is
+    shielded so a cancelled monitor task cannot leave a half-closed context.
+
+    Args:
+        active_contexts: Orchestrator's meeting URL -> context map
+        meeting_url: Meeting whose entry is dropped from active_contexts
+        context: Context the meeting ran in
+        page: Meeting page; when omitted the whole context is closed
+    """
+    async def close() -> None:
+        if page is not None and not page.is_closed():
+            await page.close()
+        if page is None or not context.pages:
+            await context.close()
+
+    try:
+        await asyncio.shield(close())
+    except Exception as e:
+        logger.warning(f"Error closing meeting page/context: {e}")
+    finally:
+        active_contexts.pop(meeting_url, None)
+
+
+class ContextPool:
+    """
+    Pre-created browser contexts that share one set of options.
+    
+    Creating a context costs a renderer round trip (and any route/script
+    setup) on the join path. The pool keeps ``size`` fresh contexts ready so
+    a join only pops one, then tops itself back up in the background.
+    
+    Contexts are never handed out twice: meetings close their context as
+    before, so no cookies, storage or recordings leak between meetings.
+    """
+    
+    def __init__(
+        self,
+        browser: Browser,
+        size: int,
+        setup: Optional[Callable[[BrowserContext], Awaitable[None]]] = None,
+        **options: Any,
+    ):
+        """
+        Args:
+            browser: Browser that owns the contexts
+            size: Contexts to keep ready (0 creates one per acquire)
+            setup: Optional coroutine applied to every new context
+            **options: Keyword arguments for browser.new_context()
+        """
+        self.browser = browser
+        self.size = size
+        self._setup = setup
+        self._options = options
+        self._ready: list[BrowserContext] = []
+        self._refill_task: Optional[asyncio.Task] = None
+        # Bumped by reconfigure() so in-flight refills drop stale contexts
+        self._generation = 0
+    
+    async def _create(self) -> BrowserContext:
+        context = await self.browser.new_context(**self._options)
+        if self._setup:
+            await self._setup(context)
+        return context
+    
+    async def _refill(self) -> None:
+        while len(self._ready) < self.size and self.browser.is_connected():
+            generation = self._generation
+            try:
+                context = await self._create()
+            except Exception as e:
+                logger.warning(f"Could not pre-create browser context: {e}")
+                return
+            if generation != self._generation:
+                await context.close()
+                continue
+            self._ready.append(context)
+    
+    def refill(self) -> None:
+        """Top the pool back up in the background (no-op while a refill runs)."""
+        if self.size and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill())
+    
+    async def reconfigure(self, **options: Any) -> None:
+        """
+        Change the new_context() options, discarding contexts built with the old ones.
+        
+        Args:
+            **options: Options to add or replace
+        """
+        self._options.update(options)
+        self._generation += 1
+        stale, self._ready = self._ready, []
+        for context in stale:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug("Closing stale pooled context failed: %s", e)
+        self.refill()
+    
+    async def acquire(self) -> BrowserContext:
+        """
+        Take a ready context, or create one if the pool is empty.
+        
+        Returns:
+            A fresh browser context owned by the caller
+        """
+        context = None
+        while self._ready and context is None:
+            candidate = self._ready.pop()
+            # Contexts die with the browser; skip any that went away
+            if candidate.browser and candidate.browser.is_connected():
+                context = candidate
+        if context is None:
+            context = await self._create()
+        self.refill()
+        return context
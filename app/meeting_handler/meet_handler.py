@@ -12,25 +12,303 @@ Handles all Google Meet meeting operations including:
 from __future__ import annotations
 
 import asyncio
+import json
 import os
+import re
+import time
+from pathlib import Path
 from typing import Optional
 
 from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
+    TimeoutError as PlaywrightTimeoutError,
 )
 
-from app.config import get_logger
+from app.config import settings, get_logger
 from app.models import MeetingDetails
 from app.transcription.service import TranscriptionService
 from app.recording import RecordingService
+from .browser_utils import (
+    ContextPool,
+    block_heavy_assets,
+    page_closed_event,
+    release_meeting,
+    sleep_unless_closed,
+)
 from datetime import datetime
 
 
 logger = get_logger("meet_handler")
 
 
+# Captions control in the call toolbar, in either state
+_MEET_CAPTION_BUTTON_SELECTOR = ", ".join([
+    'button[jsname="r8qRAd"]',
+    'button[aria-label*="Turn on captions"]',
+    'button[aria-label*="Turn off captions"]',
+    'button[icon="cc"]',
+])
+
+# Any of these visible means the Meet pre-join screen (or a login redirect,
+# or the call itself) has rendered and the join flow can start
+_MEET_PREJOIN_READY_SELECTOR = ", ".join([
+    'button:has-text("Continue without microphone and camera")',
+    'input[placeholder="Your name"]',
+    'input[aria-label="Your name"]',
+    'button:has-text("Ask to join")',
+    'button:has-text("Join now")',
+    ':text("Sign in to join")',
+    'input[type="email"]',
+    'button[aria-label*="Leave call"]',
+])
+
+# Accessible names of the pre-join button that enters (or asks to enter) the call
+_MEET_JOIN_BUTTON_NAME = re.compile(r"^(Ask to join|Join now|Join)$")
+
+# JavaScript to check whether any visible captions button reports captions on.
+# Deliberately avoids the broad aria-label*="captions" selector.
+MEET_CAPTIONS_ON_JS = (
+    "() => {\n"
+    + "    const buttons = document.querySelectorAll(" + json.dumps(_MEET_CAPTION_BUTTON_SELECTOR) + ");\n"
+    + """    for (const btn of buttons) {
+        const rect = btn.getBoundingClientRect();
+        if (!rect.width || !rect.height) continue;
+        const label = btn.getAttribute('aria-label') || '';
+        if (btn.getAttribute('aria-pressed') === 'true' || label.includes('Turn off')) return true;
+    }
+    return false;
+}
+""")
+
+# Pre-join camera/mic toggles: "on" selectors are clicked, "off" ones mean
+# the device is already muted
+_MEET_DEVICE_TOGGLES = {
+    "camera": {
+        "on": ", ".join([
+            'button[aria-label*="Turn off camera"]',
+            'button[aria-label*="camera is on"]',
+            'button[data-is-muted="false"][aria-label*="camera"]',
+            '[data-tooltip*="Turn off camera"]',
+        ]),
+        "off": ", ".join([
+            'button[aria-label*="Turn on camera"]',
+            'button[data-is-muted="true"][aria-label*="camera"]',
+        ]),
+    },
+    "mic": {
+        "on": ", ".join([
+            'button[aria-label*="Turn off microphone"]',
+            'button[aria-label*="microphone is on"]',
+            'button[data-is-muted="false"][aria-label*="microphone"]',
+            '[data-tooltip*="Turn off microphone"]',
+        ]),
+        "off": ", ".join([
+            'button[aria-label*="Turn on microphone"]',
+            'button[data-is-muted="true"][aria-label*="microphone"]',
+        ]),
+    },
+}
+
+# JavaScript to switch camera and mic off on the pre-join screen in one round-trip.
+# Returns {camera, mic}, each 'clicked' | 'already_off' | 'not_found'
+MEET_MUTE_BEFORE_JOIN_JS = """
+(toggles) => {
+    const firstVisible = (selector) => {
+        for (const el of document.querySelectorAll(selector)) {
+            const rect = el.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0) return el;
+        }
+        return null;
+    };
+
+    const result = {};
+    for (const [device, selectors] of Object.entries(toggles)) {
+        if (firstVisible(selectors.off)) {
+            result[device] = 'already_off';
+            continue;
+        }
+        const toggle = firstVisible(selectors.on);
+        if (toggle) {
+            toggle.click();
+            result[device] = 'clicked';
+        } else {
+            result[device] = 'not_found';
+        }
+    }
+    return result;
+}
+"""
+
+# Caption observer injected once transcription starts.
+# V4: uses 2.5s debouncing so only full/stable sentences are captured, which
+# prevents repetitive fragments like "Hello", "Hello I", "Hello I am".
+MEET_CAPTION_OBSERVER_JS = """
+() => {
+    console.log("Transcription Observer ROBUST V4 (Debounced) Started");
+
+    // Pending captions keyed by caption row, not text element: Meet re-renders
+    // the text inside a row, so one utterance can move to a new element.
+    // key -> {timer, el, text, speaker}
+    const pendingEmissions = new Map();
+    // Stable id per caption row, assigned when the row is first seen
+    const rowIds = new WeakMap();
+    let nextRowId = 0;
+    // Last emitted text per row, so a re-rendered row is not re-sent
+    const emittedByKey = new Map();
+    const EMITTED_TTL_MS = 30000;
+    setInterval(() => {
+        const cutoff = Date.now() - EMITTED_TTL_MS;
+        for (const [key, entry] of emittedByKey) {
+            if (entry.at < cutoff) emittedByKey.delete(key);
+        }
+    }, EMITTED_TTL_MS);
+
+    // Selectors from User HTML + Known ones
+    const TEXT_SELECTOR = '.ygicle, .VbkSUe, .bh44bd, .iTTPOb, .CNusmb, [jscontroller="yQsYHe"]';
+    // Meet emits hundreds of mutations a second while captioning; scan at most this often
+    const SCAN_INTERVAL_MS = 100;
+    let scanScheduled = false;
+
+    // Stable captions waiting to be delivered to Python, sent once per window
+    const pendingTranscripts = [];
+    const FLUSH_WINDOW_MS = 250;
+    let flushScheduled = false;
+
+    function flushTranscripts() {
+        flushScheduled = false;
+        if (pendingTranscripts.length) window.screenAppTranscriptBatch(pendingTranscripts.splice(0));
+    }
+
+    function queueTranscript(item) {
+        pendingTranscripts.push(item);
+        if (flushScheduled) return;
+        flushScheduled = true;
+        setTimeout(flushTranscripts, FLUSH_WINDOW_MS);
+    }
+
+    // Caption region, re-queried only once it is detached (or not found yet)
+    let captionScope = null;
+    function getScope() {
+        if (!captionScope || !captionScope.isConnected) {
+            captionScope = document.querySelector('[jsname="dsyhDe"]') || document.querySelector('.a4cQT');
+        }
+        return captionScope || document.body;
+    }
+
+    function emit(key, entry) {
+        let textToEmit = entry.text;
+        const lastEmitted = entry.el.dataset.lastEmitted || emittedByKey.get(key)?.text || "";
+
+        // Handling Appends: "Hello" (emitted) -> "Hello World" (new)
+        // We only want to emit "World"
+        if (entry.text.startsWith(lastEmitted)) {
+            textToEmit = entry.text.substring(lastEmitted.length).trim();
+        }
+
+        if (textToEmit && textToEmit.length > 0) {
+            queueTranscript({
+                speaker: entry.speaker,
+                text: textToEmit
+            });
+            // Mark this full text as emitted
+            entry.el.dataset.lastEmitted = entry.text;
+            emittedByKey.set(key, { text: entry.text, at: Date.now() });
+        }
+    }
+
+    function scanCaptions() {
+        scanScheduled = false;
+        const scope = getScope();
+        observeRoot(scope);
+        const textElements = scope.querySelectorAll(TEXT_SELECTOR);
+
+        textElements.forEach(el => {
+            const currentText = el.innerText;
+            if (!currentText || currentText.trim().length === 0) return;
+
+            // Check if this is exactly what we last emitted for this element (stable state)
+            if (el.dataset.lastEmitted === currentText) return;
+
+            // Speaker Detection
+            let speaker = "Unknown Speaker";
+            const rowContainer = el.closest('.nMcdL') || el.closest('.bj4p3b');
+            if (rowContainer) {
+                const nameSpan = rowContainer.querySelector('.NWpY1d');
+                if (nameSpan) speaker = nameSpan.innerText;
+            }
+            if (speaker === "Unknown Speaker") {
+                const senderContainer = el.closest('[data-sender-name]');
+                if (senderContainer) speaker = senderContainer.getAttribute('data-sender-name');
+            }
+            if (speaker === "Unknown Speaker") {
+                const nameEl = el.closest('.a4cQT')?.querySelector('.zs7s8d');
+                if (nameEl) speaker = nameEl.innerText;
+            }
+
+            const row = rowContainer || el;
+            if (!rowIds.has(row)) rowIds.set(row, ++nextRowId);
+            const key = speaker + '|' + rowIds.get(row);
+            if (emittedByKey.get(key)?.text === currentText) return;
+
+            // Unchanged since the last scan: let its stability timer keep running
+            const pending = pendingEmissions.get(key);
+            if (pending && pending.el === el && pending.text === currentText) return;
+
+            // Debounce Logic
+            // If we have a pending timer for this row, clear it (text is still changing!)
+            if (pending) {
+                clearTimeout(pending.timer);
+            }
+
+            // Set a new timer. If no changes happen for 2.5 seconds, we emit.
+            const entry = { timer: null, el, text: currentText, speaker };
+            entry.timer = setTimeout(() => {
+                pendingEmissions.delete(key);
+                emit(key, entry);
+            }, 2500); // 2.5 seconds stability wait
+
+            // Store in map
+            pendingEmissions.set(key, entry);
+        });
+    }
+
+    function scheduleScan() {
+        if (scanScheduled) return;
+        scanScheduled = true;
+        setTimeout(scanCaptions, SCAN_INTERVAL_MS);
+    }
+
+    // Coalesce each burst of mutations into one scan
+    const observer = new MutationObserver(scheduleScan);
+
+    // Watch only the caption region once it is mounted; the rest of the Meet
+    // UI (tiles, reactions, chat) mutates constantly and is of no interest
+    const OBSERVE_OPTIONS = { childList: true, subtree: true, characterData: true };
+    let observedRoot = null;
+    function observeRoot(root) {
+        if (root === observedRoot) return;
+        observer.disconnect();
+        observer.observe(root, OBSERVE_OPTIONS);
+        observedRoot = root;
+    }
+
+    // A detached caption region (captions toggled off/on) never mutates again,
+    // so fall back to the body until the region is mounted once more
+    setInterval(() => {
+        if (observedRoot !== document.body && !observedRoot.isConnected) {
+            observeRoot(document.body);
+            scheduleScan();
+        }
+    }, 2000);
+
+    observeRoot(document.body);
+    scheduleScan();
+}
+"""
+
+
 class MeetMeetingHandler:
     """Handler for Google Meet meetings."""
     
@@ -39,8 +317,24 @@ class MeetMeetingHandler:
         self.transcription_service = transcription_service
         self.s3_service = s3_service
         self.recording_service = RecordingService(s3_service=s3_service)
+        # Contexts are created ahead of joins; each meeting still gets its own
+        self._context_pool = ContextPool(
+            browser,
+            settings.bot.context_pool_size,
+            # Opt-in: blocked avatars, fonts and icons are missing from recordings
+            setup=block_heavy_assets if settings.bot.block_assets else None,
+            permissions=["microphone", "camera"],
+            ignore_https_errors=True,
+            record_video_dir="recordings/temp",  # Temporary dir, will be moved
+            record_video_size={"width": 1920, "height": 1080},
+            **self._google_state_options(),
+        )
         logger.info("MeetMeetingHandler initialized with recording service")
     
+    def warm_up(self) -> None:
+        """Start pre-creating browser contexts so the first join skips that cost."""
+        self._context_pool.refill()
+    
     async def join_meeting(self, meeting: MeetingDetails, active_contexts: dict[str, BrowserContext]) -> None:
         """
         Join a Google Meet meeting with full automation.
@@ -53,39 +347,36 @@ class MeetMeetingHandler:
         5. Wait for admission
         6. Start transcription
         """
-        # Create a new isolated context for this meeting
-        # VIDEO RECORDING STARTS HERE - capture timestamp for sync
-        import time
-        video_start_timestamp_ms = int(time.time() * 1000)
-        
-        context = await self.browser.new_context(
-            permissions=["microphone", "camera"],
-            ignore_https_errors=True,
-            record_video_dir="recordings/temp",  # Temporary dir, will be moved
-            record_video_size={"width": 1920, "height": 1080}
-        )
+        # Take a pre-created isolated context for this meeting
+        context = await self._context_pool.acquire()
         active_contexts[meeting.meeting_url] = context
         
+        # VIDEO RECORDING STARTS with the page - capture timestamp for sync
+        video_start_timestamp_ms = int(time.time() * 1000)
+        page = await context.new_page()
+        
         # Set context for recording service WITH video start timestamp
         self.recording_service.set_context(context)
         self.recording_service.set_video_start_timestamp(video_start_timestamp_ms)
-        logger.info(f"Video recording started at context creation: {video_start_timestamp_ms}")
-        
-        page = await context.new_page()
+        logger.info(f"Video recording started at page creation: {video_start_timestamp_ms}")
 
         try:
             # --- Step 1: Navigate to meeting URL ---
             logger.info(f"Navigating to {meeting.meeting_url}...")
-            await page.goto(meeting.meeting_url, wait_until="load")
+            await page.goto(meeting.meeting_url, wait_until="domcontentloaded")
             
-            # Wait for page to stabilize
-            await asyncio.sleep(3)
+            # Wait for the pre-join screen instead of a fixed pause; the
+            # checks below are instant, so they need it to have rendered
+            try:
+                await page.wait_for_selector(_MEET_PREJOIN_READY_SELECTOR, state="visible", timeout=15000)
+            except PlaywrightTimeoutError:
+                logger.warning("Meet pre-join screen not detected after 15s, continuing anyway")
             
             # --- Step 2: Dismiss Device Checks ---
             # Try to click "Continue without microphone and camera"
             try:
                 btn = page.get_by_role('button', name='Continue without microphone and camera')
-                if await btn.is_visible(timeout=5000):
+                if await btn.is_visible():
                     try:
                         await btn.click(timeout=5000)
                     except Exception as e:
@@ -111,10 +402,10 @@ class MeetMeetingHandler:
                 try:
                     # Specific check for generic input to ensure it's the right one (optional refinement)
                     input_el = page.locator(selector).first
-                    if await input_el.is_visible(timeout=2000):
+                    if await input_el.is_visible():
                         name_input = input_el
                         break
-                except:
+                except Exception:
                     continue
             
             if name_input:
@@ -139,6 +430,8 @@ class MeetMeetingHandler:
                     if not await self._perform_auto_login(page):
                          logger.error("Auto-login failed or no credentials. Aborting.")
                          return
+                    # Later joins start signed in and skip this step
+                    await self._save_google_state(context)
                 else:
                     logger.warning("Could not find name input AND not clearly on login page. Continuing to look for Join buttons...")
 
@@ -146,23 +439,22 @@ class MeetMeetingHandler:
             join_clicked = False
             clicked_btn_name = ""
             
-            # Try clicking buttons
-            for btn_name in ["Ask to join", "Join now", "Join"]:
+            # One locator covers every join button label, so a missing button
+            # costs a single short wait rather than one probe per label
+            btn = page.get_by_role("button", name=_MEET_JOIN_BUTTON_NAME).first
+            try:
+                await btn.wait_for(state="visible", timeout=3000)
+                clicked_btn_name = (await btn.inner_text()).strip()
                 try:
-                    btn = page.get_by_role("button", name=btn_name, exact=True)
-                    if await btn.is_visible(timeout=2000):
-                        try:
-                            await btn.click(timeout=5000)
-                        except Exception as click_error:
-                            logger.warning(f"Normal click failed for '{btn_name}': {click_error}. Trying force click...")
-                            await btn.click(force=True)
-                        logger.info(f"Clicked '{btn_name}' button.")
-                        await asyncio.sleep(2)
-          
-                        join_clicked = True
-                        clicked_btn_name = btn_name
-                        break
-                except: continue
+                    await btn.click(timeout=5000)
+                except Exception as click_error:
+                    logger.warning(f"Normal click failed for '{clicked_btn_name}': {click_error}. Trying force click...")
+                    await btn.click(force=True)
+                logger.info(f"Clicked '{clicked_btn_name}' button.")
+                await asyncio.sleep(2)
+                join_clicked = True
+            except Exception:
+                pass
             
             if not join_clicked:
                 logger.warning("No 'Join' button found. Check browser.")
@@ -174,31 +466,21 @@ class MeetMeetingHandler:
             # If we clicked "Ask to join", we are in a waiting state.
             logger.info("Waiting for meeting admission...")
             max_wait_time = 600 # 10 minutes wait for admission?
-            start_time = datetime.now()
             admitted = False
             
-            while (datetime.now() - start_time).total_seconds() < max_wait_time:
-                # Check for success indicator
-                leave_btn = page.locator('button[aria-label*="Leave call"]')
-                if await leave_btn.count() > 0 and await leave_btn.first.is_visible():
-                    logger.info(f"Successfully entered meeting {meeting.title} at {datetime.now()}")
-                    admitted = True
-                    break
-                
-                # Check for "Asking to join" or "You'll join when someone lets you in"
-                # This is just for logging/debugging
-                if await page.get_by_text("Asking to be admitted").is_visible() or \
-                   await page.get_by_text("You'll join the call when someone lets you in").is_visible():
-                     # Just log periodically? No, strict logging.
-                     pass 
-                
-                await asyncio.sleep(2)
+            # The Leave button appears once admitted; Playwright waits for it
+            # in the browser, so admission is seen immediately without polling
+            leave_btn = page.locator('button[aria-label*="Leave call"]').first
+            try:
+                await leave_btn.wait_for(state="visible", timeout=max_wait_time * 1000)
+                logger.info(f"Successfully entered meeting {meeting.title} at {datetime.now()}")
+                admitted = True
+            except PlaywrightTimeoutError:
+                pass
             
             if not admitted:
                 logger.error("Timed out waiting for meeting admission (10 mins). Aborting.")
-                await context.close()
-                if meeting.meeting_url in active_contexts:
-                   del active_contexts[meeting.meeting_url]
+                await release_meeting(active_contexts, meeting.meeting_url, context)
                 return
 
             # --- Step 6: Post-Join Setup (Transcription) ---
@@ -218,15 +500,30 @@ class MeetMeetingHandler:
 
         except Exception as e:
             logger.error(f"Error during join flow: {e}")
-            try:
-                logger.error("Error during join flow: {e}")
-            except:
-                pass
-            await context.close()
-            if meeting.meeting_url in active_contexts:
-                del active_contexts[meeting.meeting_url]
+            await release_meeting(active_contexts, meeting.meeting_url, context)
             return None, None
     
+    @staticmethod
+    def _google_state_options() -> dict:
+        """new_context() options that load the saved Google sign-in, if there is one."""
+        path = settings.bot.google_storage_state
+        if path and Path(path).is_file():
+            return {"storage_state": path}
+        return {}
+    
+    async def _save_google_state(self, context: BrowserContext) -> None:
+        """Persist the signed-in session so pooled contexts start authenticated."""
+        path = settings.bot.google_storage_state
+        if not path:
+            return
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=path)
+            await self._context_pool.reconfigure(storage_state=path)
+            logger.info(f"Saved Google sign-in state to {path}")
+        except Exception as e:
+            logger.warning(f"Could not save Google sign-in state: {e}")
+    
     async def _perform_auto_login(self, page: Page) -> bool:
         """Attempts to log in using env vars. Returns True if successful."""
         email = os.getenv("GOOGLE_EMAIL")
@@ -252,113 +549,36 @@ class MeetMeetingHandler:
         try:
             logger.info("Injecting transcription observer...")
 
-            # Hook console logs to see JS errors in Python logs
-            page.on("console", lambda msg: logger.info(f"BROWSER CONSOLE: {msg.text}"))
+            # Hook console logs to see JS errors in Python logs (not the info firehose)
+            page.on(
+                "console",
+                lambda msg: logger.warning("BROWSER CONSOLE %s: %s", msg.type, msg.text)
+                if msg.type in ("error", "warning") else None,
+            )
             
             # 1. Start service with meeting details
             self.transcription_service.start_transcription(meeting.title, meeting)
 
-            # 2. Expose python callback
-            async def on_transcript(data):
-                # data is expected to be {speaker: "Name", text: "..."}
-                speaker = data.get("speaker", "Unknown")
-                text = data.get("text", "")
-                if text:
-                    self.transcription_service.append_transcript(speaker, text)
+            # 2. Expose python callback (the observer delivers captions in batches)
+            # File writes run in a worker thread; the lock keeps batches in order
+            write_lock = asyncio.Lock()
+            
+            async def on_transcript_batch(items):
+                # each item is expected to be {speaker: "Name", text: "..."}
+                entries = [
+                    (data.get("speaker", "Unknown"), data.get("text", ""), None)
+                    for data in items
+                    if data.get("text")
+                ]
+                if entries:
+                    async with write_lock:
+                        await asyncio.to_thread(self.transcription_service.append_transcripts, entries)
             
             # Clean up potential existing binding
-            await page.expose_function("screenAppTranscript", on_transcript)
+            await page.expose_function("screenAppTranscriptBatch", on_transcript_batch)
 
             # 3. Inject JS
-            # Updated to V4: Uses 2.5s debouncing to ensure only full/stable sentences are captured.
-            # This prevents repetitive fragments like "Hello", "Hello I", "Hello I am".
-            js_script_robust = """
-            () => {
-                console.log("Transcription Observer ROBUST V4 (Debounced) Started");
-                
-                // Map to track timers for each element: Element -> {timer, text, speaker}
-                const pendingEmissions = new Map();
-
-                const observer = new MutationObserver((mutations) => {
-                    mutations.forEach((mutation) => {
-                        // We strictly want to handle text updates or new nodes
-                        if (mutation.type !== 'childList' && mutation.type !== 'characterData') return;
-                        
-                        // Selectors from User HTML + Known ones
-                        const textSelector = '.ygicle, .VbkSUe, .bh44bd, .iTTPOb, .CNusmb, [jscontroller="yQsYHe"]';
-                        
-                        // Limit scope
-                        let scope = document.querySelector('[jsname="dsyhDe"]') || document.querySelector('.a4cQT') || document.body;
-                        const textElements = scope.querySelectorAll(textSelector);
-                        
-                        textElements.forEach(el => {
-                            const currentText = el.innerText;
-                            if (!currentText || currentText.trim().length === 0) return;
-                            
-                            // Check if this is exactly what we last emitted for this element (stable state)
-                            if (el.dataset.lastEmitted === currentText) return;
-
-                            // Speaker Detection
-                            let speaker = "Unknown Speaker";
-                            const rowContainer = el.closest('.nMcdL') || el.closest('.bj4p3b');
-                            if (rowContainer) {
-                                const nameSpan = rowContainer.querySelector('.NWpY1d');
-                                if (nameSpan) speaker = nameSpan.innerText;
-                            }
-                            if (speaker === "Unknown Speaker") {
-                                const senderContainer = el.closest('[data-sender-name]');
-                                if (senderContainer) speaker = senderContainer.getAttribute('data-sender-name');
-                            }
-                            if (speaker === "Unknown Speaker") {
-                                const nameEl = el.closest('.a4cQT')?.querySelector('.zs7s8d');
-                                if (nameEl) speaker = nameEl.innerText;
-                            }
-
-                            // Debounce Logic
-                            // If we have a pending timer for this element, clear it (text is still changing!)
-                            if (pendingEmissions.has(el)) {
-                                clearTimeout(pendingEmissions.get(el).timer);
-                            }
-
-                            // Set a new timer. If no changes happen for 2.5 seconds, we emit.
-                            const timer = setTimeout(() => {
-                                // Final extraction logic
-                                let textToEmit = currentText;
-                                const lastEmitted = el.dataset.lastEmitted || "";
-                                
-                                // Handling Appends: "Hello" (emitted) -> "Hello World" (new)
-                                // We only want to emit "World"
-                                if (currentText.startsWith(lastEmitted)) {
-                                    textToEmit = currentText.substring(lastEmitted.length).trim();
-                                }
-                                
-                                // Clean up punctuation-only updates if necessary (e.g. just adding a dot)
-                                // But generally if it's a new word, we want it.
-                                
-                                if (textToEmit && textToEmit.length > 0) {
-                                    console.log(`Captured (Stable): ${speaker}: ${textToEmit}`);
-                                    window.screenAppTranscript({
-                                        speaker: speaker,
-                                        text: textToEmit
-                                    });
-                                    // Mark this full text as emitted
-                                    el.dataset.lastEmitted = currentText;
-                                }
-                                
-                                pendingEmissions.delete(el);
-                            }, 2500); // 2.5 seconds stability wait
-
-                            // Store in map
-                            pendingEmissions.set(el, { timer, text: currentText, speaker });
-                        });
-                    });
-                });
-                
-                observer.observe(document.body, { childList: true, subtree: true, characterData: true });
-            }
-            """
-            
-            await page.evaluate(js_script_robust)
+            await page.evaluate(MEET_CAPTION_OBSERVER_JS)
             
             # 4. Spawn Caption Enabler Background Task
             # We spawn this so it doesn't block main join flow (which needs to start monitor)
@@ -370,76 +590,59 @@ class MeetMeetingHandler:
 
     async def _ensure_captions_loop(self, page: Page) -> None:
         """Background task to ensure captions are enabled."""
-        logger.info("Starting loop to ensure captions are enabled (checking every 30s)...")
+        logger.info("Starting loop to ensure captions are enabled (retrying every 10-120s)...")
         
-        # Wait a moment for UI to settle before first check
-        await asyncio.sleep(5)
+        closed = page_closed_event(page)
+        # Doubles after every failed attempt; captions rarely fix themselves quickly
+        interval = 10
+        # Built once and reused by every iteration
+        turn_off_btn = page.locator('button[aria-label*="Turn off captions"]').first
+        
+        # Wait for the captions control to render rather than a fixed settle delay
+        try:
+            await page.locator(_MEET_CAPTION_BUTTON_SELECTOR).first.wait_for(state="visible", timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
+        except Exception:
+            if closed.is_set():
+                return
         
         try:
             while True:
-                # Safety check: Stop if page/browser is closed
-                if page.is_closed():
-                    logger.debug("Page closed, stopping caption check.")
-                    break
-                    
                 try:
                     # 1. Check if "Turn off captions" exists -> If yes, they are ON.
-                    turn_off_btn = page.locator('button[aria-label*="Turn off captions"]')
-                    if await turn_off_btn.count() > 0 and await turn_off_btn.first.is_visible():
+                    if await turn_off_btn.is_visible():
                         logger.info("Captions are ON (Found 'Turn off captions' button).")
                         break
                     
                     # 1.5 Try keyboard shortcut first (most reliable - bypasses overlays)
                     logger.info("Attempting to enable captions with keyboard shortcut 'c'...")
                     await page.keyboard.press("c")
-                    await asyncio.sleep(2)
                     
-                    # Check if it worked
-                    if await turn_off_btn.count() > 0 and await turn_off_btn.first.is_visible():
+                    # Check if it worked; resolves as soon as the button appears
+                    try:
+                        await turn_off_btn.wait_for(state="visible", timeout=2000)
                         logger.info("Successfully enabled captions with keyboard shortcut 'c'.")
-                        break 
-                    
-                    # 2. Verify button state indicates captions are on
-                    selectors = [
-                        'button[jsname="r8qRAd"]',
-                        'button[aria-label*="Turn on captions"]',
-                        'button[aria-label*="captions"]', 
-                        'button[icon="cc"]'
-                    ]
-                    
-                    captions_already_on = False
-                    
-                    for sel in selectors:
-                        btns = page.locator(sel)
-                        count = await btns.count()
-                        
-                        for i in range(count):
-                            btn = btns.nth(i)
-                            if not await btn.is_visible():
-                                continue
-                            
-                            is_pressed = await btn.get_attribute("aria-pressed")
-                            label = await btn.get_attribute("aria-label") or ""
-                            
-                            if is_pressed == "true" or "Turn off" in label:
-                                captions_already_on = True
-                                break
-                        
-                        if captions_already_on:
-                            break
+                        break
+                    except PlaywrightTimeoutError:
+                        pass
                     
-                    if captions_already_on:
+                    # 2. Verify button state indicates captions are on (one evaluate)
+                    if await page.evaluate(MEET_CAPTIONS_ON_JS):
                         logger.info("Captions are ON (verified via button state).")
                         break
                     
                     # If keyboard shortcut didn't work after first attempt, log and retry next cycle
-                    logger.warning("Keyboard shortcut 'c' didn't enable captions yet. Will retry next cycle...")
+                    logger.warning(f"Keyboard shortcut 'c' didn't enable captions yet. Will retry in {interval}s...")
                         
                 except Exception as e:
                      logger.warning(f"Error in caption logic: {e}")
 
-                # Wait 30 seconds before next check
-                await asyncio.sleep(10)
+                # Wait before next check; stop as soon as the page/browser closes
+                if await sleep_unless_closed(closed, interval):
+                    logger.debug("Page closed, stopping caption check.")
+                    break
+                interval = min(interval * 2, 120)
                 
         except asyncio.CancelledError:
             logger.info("Caption check task cancelled.")
@@ -453,68 +656,32 @@ class MeetMeetingHandler:
         """
         logger.info("Ensuring camera and microphone are OFF before joining...")
         
-        # Camera toggle selectors (Google Meet)
-        camera_selectors = [
-            'button[aria-label*="Turn off camera"]',
-            'button[aria-label*="camera is on"]',
-            'button[data-is-muted="false"][aria-label*="camera"]',
-            '[data-tooltip*="Turn off camera"]',
-        ]
-        
-        # Mic toggle selectors (Google Meet)
-        mic_selectors = [
-            'button[aria-label*="Turn off microphone"]',
-            'button[aria-label*="microphone is on"]', 
-            'button[data-is-muted="false"][aria-label*="microphone"]',
-            '[data-tooltip*="Turn off microphone"]',
-        ]
-        
-        # Try to turn off camera
-        camera_off = False
-        for selector in camera_selectors:
-            try:
-                btn = page.locator(selector).first
-                if await btn.is_visible(timeout=1000):
-                    await btn.click()
-                    camera_off = True
-                    logger.info(f"✅ Camera turned OFF via: {selector}")
-                    await asyncio.sleep(0.5)
-                    break
-            except Exception:
-                continue
-        
-        if not camera_off:
-            # Try keyboard shortcut: Ctrl+E toggles camera in Meet
-            try:
-                await page.keyboard.press("Control+e")
-                logger.info("Sent Ctrl+E to toggle camera")
-                await asyncio.sleep(0.5)
-            except Exception:
-                pass
+        # Both toggles are read (and clicked if on) in a single evaluate
+        try:
+            result = await page.evaluate(MEET_MUTE_BEFORE_JOIN_JS, _MEET_DEVICE_TOGGLES)
+        except Exception as e:
+            logger.warning(f"Error turning off camera/mic: {e}")
+            result = {"camera": "not_found", "mic": "not_found"}
         
-        # Try to turn off microphone
-        mic_off = False
-        for selector in mic_selectors:
-            try:
-                btn = page.locator(selector).first
-                if await btn.is_visible(timeout=1000):
-                    await btn.click()
-                    mic_off = True
-                    logger.info(f"✅ Microphone turned OFF via: {selector}")
-                    await asyncio.sleep(0.5)
-                    break
-            except Exception:
-                continue
+        # Keyboard shortcuts are blind toggles: only use them for a device
+        # whose toggle was not found at all, never one already OFF
+        shortcuts = {"camera": "Control+e", "mic": "Control+d"}
+        for device in ("camera", "mic"):
+            state = result.get(device)
+            if state == "clicked":
+                logger.info(f"✅ {device.capitalize()} turned OFF")
+            elif state == "already_off":
+                logger.info(f"{device.capitalize()} already OFF")
+            else:
+                try:
+                    await page.keyboard.press(shortcuts[device])
+                    logger.info(f"Sent {shortcuts[device]} to toggle {device}")
+                except Exception:
+                    pass
         
-        if not mic_off:
-            # Try keyboard shortcut: Ctrl+D toggles mic in Meet
-            try:
-                await page.keyboard.press("Control+d")
-                logger.info("Sent Ctrl+D to toggle microphone")
-                await asyncio.sleep(0.5)
-            except Exception:
-                pass
+        if any(state != "already_off" for state in result.values()):
+            # Let the toggles settle before continuing
+            await asyncio.sleep(0.5)
         
-        if not camera_off and not mic_off:
+        if all(state == "not_found" for state in result.values()):
             logger.warning("Could not find camera/mic toggle buttons. Bot may show test pattern.")
-
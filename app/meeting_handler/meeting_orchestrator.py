@@ -8,9 +8,12 @@ Handles unified monitoring and cleanup across all platforms.
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+import hashlib
 from pathlib import Path
 import json
-from typing import Optional
+from threading import Lock
+from typing import Callable, Optional
 
 from playwright.async_api import (
     Browser,
@@ -18,12 +21,20 @@ from playwright.async_api import (
     Page,
 )
 
-from app.config import get_logger
+from app.config import settings, get_logger
 from app.models import MeetingDetails, MeetingPlatform
 from app.transcription.service import TranscriptionService
 from app.storage.s3_service import S3Service
 from app.storage.meeting_database import MeetingDatabase
-from .teams_scripts import get_selectors_for
+from .browser_utils import (
+    first_match,
+    match_each,
+    page_closed_event,
+    release_meeting,
+    sleep_unless_closed,
+    to_dom_matcher,
+)
+from .teams_scripts import TEAMS_MEETING_STATE_CALL_JS, get_selectors_for
 from .teams_meeting_handler import TeamsMeetingHandler
 from .zoom_meeting_handler import ZoomMeetingHandler
 from .meet_handler import MeetMeetingHandler
@@ -31,6 +42,53 @@ from .meet_handler import MeetMeetingHandler
 
 logger = get_logger("meeting_orchestrator")
 
+# Matchers checked on every monitor tick, built once at import
+_TEAMS_DENIED_MATCHER = to_dom_matcher(get_selectors_for("entry_denied"))
+_LEAVE_SELECTORS = {
+    "teams": get_selectors_for("leave_button"),
+    "google_meet": ('button[aria-label*="Leave call"]', 'button[aria-label*="Leave"]'),
+    "zoom": ('button[aria-label*="Leave"]', 'button[title*="Leave"]'),
+}
+_DEFAULT_LEAVE_SELECTORS = ('button[aria-label*="Leave"]', 'button[title*="Leave"]')
+_LEAVE_MATCHERS = {platform: to_dom_matcher(sels) for platform, sels in _LEAVE_SELECTORS.items()}
+_DEFAULT_LEAVE_MATCHER = to_dom_matcher(_DEFAULT_LEAVE_SELECTORS)
+
+# Fallback "still in the meeting" evidence when the Leave button is not visible
+_COMMON_IN_MEETING_INDICATORS = (
+    '[data-tid="roster-list"]',  # Teams
+    '[class*="participant"]',
+    '[class*="Participant"]',
+    'button[aria-label*="Mute"]',
+    'button[aria-label*="microphone"]',
+    '[class*="meeting"]',
+    'video',  # If video element exists, likely still in meeting
+    '[class*="call-controls"]',
+    '[class*="CallControls"]',
+)
+_IN_MEETING_INDICATORS = {
+    "google_meet": _COMMON_IN_MEETING_INDICATORS + (
+        '[data-is-muted]',  # Meet mute indicators
+        '[data-participant-id]',  # Meet participants
+    ),
+    "zoom": _COMMON_IN_MEETING_INDICATORS + (
+        '[class*="footer-button"]',  # Zoom controls
+        '[id*="footer"]',
+    ),
+}
+# One matcher per selector so a hit can be reported by name
+_IN_MEETING_MATCHERS = {
+    platform: tuple(to_dom_matcher([sel]) for sel in indicators)
+    for platform, indicators in _IN_MEETING_INDICATORS.items()
+}
+_DEFAULT_IN_MEETING_MATCHERS = tuple(to_dom_matcher([sel]) for sel in _COMMON_IN_MEETING_INDICATORS)
+# The re-check after a miss only trusts the first five common indicators
+_IN_MEETING_RECHECK_MATCHER = to_dom_matcher(_COMMON_IN_MEETING_INDICATORS[:5])
+
+
+# Manual joins may bring their own S3 credentials. Repeat uploads reuse the
+# boto client, but only the most recent few credential sets stay in memory.
+_CUSTOM_S3_CACHE_SIZE = 8
+
 
 class MeetingOrchestrator:
     """
@@ -42,11 +100,26 @@ class MeetingOrchestrator:
     - S3 upload and database updates
     """
     
-    def __init__(self, browser: Browser):
+    def __init__(
+        self,
+        browser: Browser,
+        on_meeting_finished: Optional[Callable[[MeetingDetails], None]] = None,
+    ):
         self.browser = browser
+        # Told once a monitored meeting has been cleaned up
+        self._on_meeting_finished = on_meeting_finished
         
         # Track active contexts for meetings that are being monitored
         self.active_contexts: dict[str, BrowserContext] = {}
+        
+        # Bound how many meetings run the (browser-heavy) join flow at once
+        self._join_semaphore = asyncio.Semaphore(settings.bot.max_concurrent_joins)
+        # Strong references to monitor tasks; discarded when they finish
+        self._background_tasks: set[asyncio.Task] = set()
+        # Manual-join S3 services, keyed by a hash of their configuration so
+        # raw secrets are not kept as keys; used from to_thread workers
+        self._custom_s3_services: OrderedDict[str, S3Service] = OrderedDict()
+        self._custom_s3_lock = Lock()
 
         # Services
         self.transcription_service = TranscriptionService()
@@ -58,6 +131,18 @@ class MeetingOrchestrator:
         self.zoom_handler = ZoomMeetingHandler(browser)
         self.meet_handler = MeetMeetingHandler(browser, self.transcription_service, self.s3_service)
     
+    def warm_up(self, platforms: frozenset[str]) -> None:
+        """
+        Pre-create browser contexts for the pooled handlers in the background.
+        
+        Args:
+            platforms: Enabled MeetingPlatform values; disabled platforms stay cold
+        """
+        if MeetingPlatform.GOOGLE_MEET.value in platforms:
+            self.meet_handler.warm_up()
+        if MeetingPlatform.ZOOM.value in platforms:
+            self.zoom_handler.warm_up()
+    
     async def join_meeting(self, meeting: MeetingDetails) -> None:
         """
         Route meeting to appropriate platform handler and start unified monitoring.
@@ -69,6 +154,7 @@ class MeetingOrchestrator:
         # Check for duplicates
         if meeting.meeting_url in self.active_contexts:
             logger.info(f"Meeting '{meeting.title}' ({meeting.meeting_url}) is already active. Skipping duplicate join.")
+            meeting.is_joined = False
             return
 
         logger.info(
@@ -78,23 +164,30 @@ class MeetingOrchestrator:
 
         try:
             # Route to appropriate handler
-            if meeting.platform == MeetingPlatform.TEAMS:
-                context, page = await self.teams_handler.join_meeting(meeting, self.active_contexts)
-            elif meeting.platform == MeetingPlatform.ZOOM:
-                context, page = await self.zoom_handler.join_meeting(meeting, self.active_contexts)
-            elif meeting.platform == MeetingPlatform.GOOGLE_MEET:
-                context, page = await self.meet_handler.join_meeting(meeting, self.active_contexts)
-            else:
-                logger.error(f"Unsupported platform: {meeting.platform.value}")
-                return
+            async with self._join_semaphore:
+                if meeting.platform == MeetingPlatform.TEAMS:
+                    context, page = await self.teams_handler.join_meeting(meeting, self.active_contexts)
+                elif meeting.platform == MeetingPlatform.ZOOM:
+                    context, page = await self.zoom_handler.join_meeting(meeting, self.active_contexts)
+                elif meeting.platform == MeetingPlatform.GOOGLE_MEET:
+                    context, page = await self.meet_handler.join_meeting(meeting, self.active_contexts)
+                else:
+                    logger.error(f"Unsupported platform: {meeting.platform.value}")
+                    meeting.is_joined = False
+                    return
             
             # Start unified monitoring if join was successful
             if context and page:
                 platform_name = meeting.platform.value.lower().replace(" ", "_")
-                asyncio.create_task(self._monitor_meeting_unified(context, page, meeting, platform_name))
+                task = asyncio.create_task(self._monitor_meeting_unified(context, page, meeting, platform_name))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
                 logger.info(f"{meeting.platform.value} meeting monitoring started for: {meeting.title}")
+            else:
+                meeting.is_joined = False
             
         except Exception as exc:
+            meeting.is_joined = False
             logger.error(f"Failed to join meeting {meeting.title}: {exc}")
     
     async def _monitor_meeting_unified(
@@ -109,110 +202,63 @@ class MeetingOrchestrator:
         Handles meeting end detection and cleanup.
         """
         logger.info(f"Monitoring {platform} meeting: {meeting.title}")
+        closed = page_closed_event(page)
+        state_changed = await self._watch_teams_state(page) if platform == "teams" else None
         
         try:
             while True:
-                if page.is_closed():
+                # Check at most every 10 seconds; a page close ends the loop at once.
+                # Teams sleeps until its in-page watcher reports a state change;
+                # other platforms block until the Leave button disappears.
+                if state_changed is not None:
+                    stop = await self._wait_for_state_change(closed, state_changed)
+                else:
+                    stop = await sleep_unless_closed(closed, 10) or (
+                        platform != "teams" and await self._wait_for_leave_hidden(page, closed, platform)
+                    )
+                if stop:
                     logger.info(f"{platform} page closed for: {meeting.title}")
                     break
                 
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
                 # Check for meeting end indicators
                 try:
-                    # Check if we've been removed/kicked (mainly for Teams)
+                    # One page.evaluate per tick: removal/denial (Teams) plus
+                    # the Leave button (universal indicator)
+                    leave_matcher = _LEAVE_MATCHERS.get(platform, _DEFAULT_LEAVE_MATCHER)
                     if platform == "teams":
-                        denied_selectors = get_selectors_for("entry_denied")
-                        for selector in denied_selectors:
-                            try:
-                                msg = page.locator(selector)
-                                if await msg.count() > 0 and await msg.first.is_visible(timeout=1000):
-                                    logger.info(f"Meeting ended or was removed: {meeting.title}")
-                                    meeting.was_kicked = True
-                                    raise StopIteration()
-                            except StopIteration:
-                                raise
-                            except:
-                                continue
-                    
-                    # Check if Leave button is gone (universal indicator)
-                    leave_visible = False
-                    
-                    # INEFFICIENT: This nested loop structure is overly complex and slow
-                    # TODO: Optimize with single pass through combined selectors
-                    # Platform-specific leave button selectors
-                    if platform == "teams":
-                        leave_selectors = get_selectors_for("leave_button")
-                    elif platform == "google_meet":
-                        leave_selectors = ['button[aria-label*="Leave call"]', 'button[aria-label*="Leave"]']
-                    elif platform == "zoom":
-                        leave_selectors = ['button[aria-label*="Leave"]', 'button[title*="Leave"]']
+                        # Cached by the in-page watcher; sweep directly if it is missing
+                        state = await page.evaluate(TEAMS_MEETING_STATE_CALL_JS)
+                        if state is None:
+                            state = await match_each(page, [_TEAMS_DENIED_MATCHER, leave_matcher])
+                        denied, leave_visible = state
+                        if denied:
+                            logger.info(f"Meeting ended or was removed: {meeting.title}")
+                            meeting.was_kicked = True
+                            break
                     else:
-                        leave_selectors = ['button[aria-label*="Leave"]', 'button[title*="Leave"]']
-                    
-                    for selector in leave_selectors:
-                        try:
-                            leave_btn = page.locator(selector)
-                            if await leave_btn.count() > 0 and await leave_btn.first.is_visible(timeout=1000):
-                                leave_visible = True
-                                break
-                        except:
-                            continue
+                        leave_visible = await first_match(page, [leave_matcher]) >= 0
                     
                     if not leave_visible:
                         # Double-check by looking for other in-meeting indicators
-                        # INEFFICIENT: Too many selectors and nested loops
-                        # TODO: Create unified selector list per platform
-                        in_meeting_indicators = [
-                            '[data-tid="roster-list"]',  # Teams
-                            '[class*="participant"]',
-                            '[class*="Participant"]',
-                            'button[aria-label*="Mute"]',
-                            'button[aria-label*="microphone"]',
-                            '[class*="meeting"]',
-                            'video',  # If video element exists, likely still in meeting
-                            '[class*="call-controls"]',
-                            '[class*="CallControls"]',
-                        ]
-                        
-                        # Add platform-specific indicators
-                        if platform == "google_meet":
-                            in_meeting_indicators.extend([
-                                '[data-is-muted]',  # Meet mute indicators
-                                '[data-participant-id]',  # Meet participants
-                            ])
-                        elif platform == "zoom":
-                            in_meeting_indicators.extend([
-                                '[class*="footer-button"]',  # Zoom controls
-                                '[id*="footer"]',
-                            ])
-                        
-                        still_in_meeting = False
-                        for indicator_sel in in_meeting_indicators:
-                            try:
-                                indicator = page.locator(indicator_sel)
-                                if await indicator.count() > 0:
-                                    still_in_meeting = True
-                                    logger.debug(f"Still in meeting - found: {indicator_sel}")
-                                    break
-                            except:
-                                continue
+                        in_meeting_indicators = _IN_MEETING_INDICATORS.get(platform, _COMMON_IN_MEETING_INDICATORS)
+                        found = await first_match(
+                            page,
+                            list(_IN_MEETING_MATCHERS.get(platform, _DEFAULT_IN_MEETING_MATCHERS)),
+                            visible=False,
+                        )
+                        still_in_meeting = found >= 0
+                        if still_in_meeting:
+                            logger.debug("Still in meeting - found: %s", in_meeting_indicators[found])
                         
                         if not still_in_meeting:
                             logger.info(f"No in-meeting indicators found - meeting may have ended: {meeting.title}")
                             # Wait and check again to avoid false positives
-                            await asyncio.sleep(5)
+                            if await sleep_unless_closed(closed, 5):
+                                logger.info(f"{platform} page closed for: {meeting.title}")
+                                break
                             
                             # Check one more time
-                            final_check = False
-                            for indicator_sel in in_meeting_indicators[:5]:
-                                try:
-                                    indicator = page.locator(indicator_sel)
-                                    if await indicator.count() > 0:
-                                        final_check = True
-                                        break
-                                except:
-                                    continue
+                            final_check = await first_match(page, [_IN_MEETING_RECHECK_MATCHER], visible=False) >= 0
                             
                             if not final_check:
                                 logger.info(f"Confirmed: meeting appears to have ended: {meeting.title}")
@@ -220,10 +266,8 @@ class MeetingOrchestrator:
                             else:
                                 logger.debug("False positive - still in meeting after recheck")
                     
-                except StopIteration:
-                    break
                 except Exception as e:
-                    logger.debug(f"Monitor check error: {e}")
+                    logger.debug("Monitor check error: %s", e)
                     
         except asyncio.CancelledError:
             logger.info(f"{platform} meeting monitor cancelled for: {meeting.title}")
@@ -236,6 +280,85 @@ class MeetingOrchestrator:
         finally:
             await self._cleanup_meeting_session(context, page, meeting, platform)
     
+    @staticmethod
+    async def _watch_teams_state(page: Page) -> Optional[asyncio.Event]:
+        """
+        Arm the Teams meeting-state watcher's change callback.
+        
+        Args:
+            page: Teams meeting page (with TEAMS_PAGE_INIT_JS installed)
+            
+        Returns:
+            Event set whenever [denied, leave] changes in the page, or None
+            if the callback could not be exposed (the monitor then polls)
+        """
+        changed = asyncio.Event()
+        try:
+            await page.expose_function("screenAppMeetingStateChanged", changed.set)
+        except Exception as e:
+            logger.debug("Teams state callback unavailable, polling instead: %s", e)
+            return None
+        return changed
+    
+    @staticmethod
+    async def _wait_for_state_change(
+        closed: asyncio.Event, changed: asyncio.Event, timeout: float = 10
+    ) -> bool:
+        """
+        Wait for the in-page watcher to report a change.
+        
+        The watcher's probe is CSS-only, so text-only end states (e.g. "Meeting
+        has ended") never wake it; the timeout keeps the old 10s tick for those.
+        
+        Args:
+            closed: Event from page_closed_event()
+            changed: Event from _watch_teams_state()
+            timeout: Longest wait between checks, in seconds
+            
+        Returns:
+            True if the page closed while waiting
+        """
+        waiters = [asyncio.create_task(closed.wait()), asyncio.create_task(changed.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        changed.clear()
+        return closed.is_set()
+    
+    @staticmethod
+    async def _wait_for_leave_hidden(page: Page, closed: asyncio.Event, platform: str) -> bool:
+        """
+        Wait until the platform's Leave button is no longer visible.
+        
+        The Leave button disappears when the call ends, so the monitor only
+        needs to run its checks after this returns.
+        
+        Args:
+            page: Meeting page
+            closed: Event from page_closed_event()
+            platform: Platform key into _LEAVE_SELECTORS
+            
+        Returns:
+            True if the page closed while waiting
+        """
+        leave_btn = page.locator(", ".join(_LEAVE_SELECTORS.get(platform, _DEFAULT_LEAVE_SELECTORS))).first
+        waiters = [
+            asyncio.create_task(closed.wait()),
+            asyncio.create_task(leave_btn.wait_for(state="hidden", timeout=0)),
+        ]
+        try:
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        for waiter in done:
+            # A page closing mid-wait fails wait_for; the close event covers it
+            if not waiter.cancelled() and waiter.exception():
+                logger.debug("Leave button wait ended: %s", waiter.exception())
+        return closed.is_set() or page.is_closed()
+    
     async def _cleanup_meeting_session(
         self, 
         context: BrowserContext, 
@@ -248,202 +371,273 @@ class MeetingOrchestrator:
         Handles transcription stop, JSON export, and resource cleanup.
         """
         logger.info(f"Closing {platform} session for: {meeting.title}")
+        meeting.is_completed = True
         
         # Stop transcription
         self.transcription_service.stop_transcription()
         
-        # Stop recording if active
-        recording_info = None
-        try:
-            handler = None
-            if platform == "teams":
-                handler = self.teams_handler
-            elif platform == "google_meet":
-                handler = self.meet_handler
-            
-            if handler and handler.recording_service.is_recording:
-                logger.info("Stopping recording...")
-                recording_info = await handler.recording_service.stop_recording()
-                if recording_info:
-                    logger.info(f"Recording saved: {recording_info.get('recording_id')}")
-                    logger.info(f"Files: {list(recording_info.get('files', {}).keys())}")
-        except Exception as e:
-            logger.warning(f"Error stopping recording: {e}")
-        
-        # Stop speaking tracker and collect data (Teams only for now)
-        speaking_data = None
-        try:
-            if platform == "teams" and self.teams_handler.speaking_tracker:
-                logger.info("Stopping speaking tracker...")
-                speaking_data = await self.teams_handler.speaking_tracker.stop()
-                segment_count = len(speaking_data.get('speaking_segments', []))
-                event_count = len(speaking_data.get('participant_events', []))
-                logger.info(f"✅ Speaking tracker stopped: {segment_count} segments, {event_count} events")
-                # Clear tracker reference
-                self.teams_handler.speaking_tracker = None
-        except Exception as e:
-            logger.warning(f"Error stopping speaking tracker: {e}")
+        # Stop recording and speaking tracker concurrently; they are independent
+        recording_info, speaking_data = await asyncio.gather(
+            self._stop_recording(platform, meeting),
+            self._stop_speaking_tracker(platform, meeting),
+        )
         
         # Export to JSON and upload to S3
         try:
             logger.info("Exporting meeting data to JSON...")
             meeting_data = self.transcription_service.export_to_json()
             
-            # Check if meeting has custom S3 configuration (from manual join)
-            s3_service = None
-            if meeting.s3_config:
-                # Use custom S3 configuration provided during manual join
-                logger.info(f"Using custom S3 configuration for bucket: {meeting.s3_config.get('bucket_name')}")
-                s3_service = S3Service(
-                    bucket_name=meeting.s3_config.get('bucket_name'),
-                    access_key_id=meeting.s3_config.get('access_key_id'),
-                    secret_access_key=meeting.s3_config.get('secret_access_key'),
-                    region=meeting.s3_config.get('region', 'us-east-1')
-                )
-            else:
-                # Use default S3 service (environment variables)
-                s3_service = self.s3_service
+            # S3 uploads, database writes and local JSON dumps are blocking I/O;
+            # run them off the event loop so other meetings keep being serviced
+            await asyncio.to_thread(
+                self._persist_meeting_data, meeting, meeting_data, recording_info, speaking_data
+            )
             
-            # Get meeting ID for consistent directory naming
-            meeting_id = meeting.meeting_id or meeting_data.get('metadata', {}).get('meeting_id', 'unknown')
+            # Reset metadata for next meeting
+            self.transcription_service.reset_metadata()
             
-            # Upload to S3 if enabled
-            if s3_service and s3_service.is_enabled():
-                # Upload transcription JSON to {meeting_id}/json/
-                s3_path = s3_service.upload_meeting_json(meeting_data, meeting_id)
-                if s3_path:
-                    logger.info(f"✅ Transcription uploaded to S3: {s3_path}")
+        except Exception as export_error:
+            logger.error(f"Error exporting meeting data: {export_error}")
+        
+        # Close the page, and the context once no other meeting shares it
+        await release_meeting(self.active_contexts, meeting.meeting_url, context, page)
+        
+        if self._on_meeting_finished:
+            self._on_meeting_finished(meeting)
+    
+    def _persist_meeting_data(
+        self,
+        meeting: MeetingDetails,
+        meeting_data: dict,
+        recording_info: Optional[dict],
+        speaking_data: Optional[dict]
+    ) -> None:
+        """
+        Upload meeting data to S3 (or save it locally) and record it in the database.
+        Blocking; called via asyncio.to_thread from session cleanup.
+        """
+        # Check if meeting has custom S3 configuration (from manual join)
+        s3_service = None
+        if meeting.s3_config:
+            # Use custom S3 configuration provided during manual join
+            logger.info(f"Using custom S3 configuration for bucket: {meeting.s3_config.get('bucket_name')}")
+            s3_service = self._get_custom_s3_service(meeting.s3_config)
+        else:
+            # Use default S3 service (environment variables)
+            s3_service = self.s3_service
+        
+        # Get meeting ID for consistent directory naming
+        meeting_id = meeting.meeting_id or meeting_data.get('metadata', {}).get('meeting_id', 'unknown')
+        
+        # Upload to S3 if enabled
+        if s3_service and s3_service.is_enabled():
+            # Upload transcription JSON to {meeting_id}/json/
+            s3_path = s3_service.upload_meeting_json(meeting_data, meeting_id)
+            if s3_path:
+                logger.info(f"✅ Transcription uploaded to S3: {s3_path}")
+            else:
+                logger.warning("Transcription S3 upload failed")
+            
+            # Upload speaking tracker data to {meeting_id}/json/ (separate file)
+            if speaking_data:
+                speaking_s3_path = s3_service.upload_speaking_json(speaking_data, meeting_id)
+                if speaking_s3_path:
+                    logger.info(f"✅ Speaking data uploaded to S3: {speaking_s3_path}")
                 else:
-                    logger.warning("Transcription S3 upload failed")
+                    logger.warning("Speaking data S3 upload failed")
+            
+            # Upload recording files (audio and video) if available
+            if recording_info and recording_info.get('files'):
+                meeting_id = meeting.meeting_id or recording_info.get('recording_id')
+                files = recording_info['files']
+                s3_keys = {}
                 
-                # Upload speaking tracker data to {meeting_id}/json/ (separate file)
-                if speaking_data:
-                    speaking_s3_path = s3_service.upload_speaking_json(speaking_data, meeting_id)
-                    if speaking_s3_path:
-                        logger.info(f"✅ Speaking data uploaded to S3: {speaking_s3_path}")
+                # Upload video with audio
+                if 'video_with_audio' in files:
+                    video_path = files['video_with_audio']['path']
+                    logger.info(f"Uploading video with audio to S3: {video_path}")
+                    video_s3_key = s3_service.upload_recording(video_path, meeting_id, "video_audio")
+                    if video_s3_key:
+                        s3_keys['video_audio'] = f"s3://{s3_service.bucket_name}/{video_s3_key}"
+                        logger.info(f"✅ Video with audio uploaded to S3: {s3_keys['video_audio']}")
                     else:
-                        logger.warning("Speaking data S3 upload failed")
+                        logger.warning("Failed to upload video with audio to S3")
                 
-                # Upload recording files (audio and video) if available
-                if recording_info and recording_info.get('files'):
-                    meeting_id = meeting.meeting_id or recording_info.get('recording_id')
-                    files = recording_info['files']
-                    s3_keys = {}
-                    
-                    # Upload video with audio
-                    if 'video_with_audio' in files:
-                        video_path = files['video_with_audio']['path']
-                        logger.info(f"Uploading video with audio to S3: {video_path}")
-                        video_s3_key = s3_service.upload_recording(video_path, meeting_id, "video_audio")
-                        if video_s3_key:
-                            s3_keys['video_audio'] = f"s3://{s3_service.bucket_name}/{video_s3_key}"
-                            logger.info(f"✅ Video with audio uploaded to S3: {s3_keys['video_audio']}")
-                        else:
-                            logger.warning("Failed to upload video with audio to S3")
-                    
-                    # Upload video only (if separate)
-                    elif 'video_only' in files:
-                        video_path = files['video_only']['path']
-                        logger.info(f"Uploading video-only to S3: {video_path}")
-                        video_s3_key = s3_service.upload_recording(video_path, meeting_id, "video_only")
-                        if video_s3_key:
-                            s3_keys['video_only'] = f"s3://{s3_service.bucket_name}/{video_s3_key}"
-                            logger.info(f"✅ Video-only uploaded to S3: {s3_keys['video_only']}")
-                        else:
-                            logger.warning("Failed to upload video-only to S3")
-                    
-                    # Upload audio only
-                    if 'audio_only' in files:
-                        audio_path = files['audio_only']['path']
-                        logger.info(f"Uploading audio-only to S3: {audio_path}")
-                        audio_s3_key = s3_service.upload_recording(audio_path, meeting_id, "audio_only")
-                        if audio_s3_key:
-                            s3_keys['audio_only'] = f"s3://{s3_service.bucket_name}/{audio_s3_key}"
-                            logger.info(f"✅ Audio-only uploaded to S3: {s3_keys['audio_only']}")
-                        else:
-                            logger.warning("Failed to upload audio-only to S3")
-                    
-                    # Upload audio for transcription (if separate)
-                    elif 'audio_for_transcription' in files:
-                        audio_path = files['audio_for_transcription']['path']
-                        logger.info(f"Uploading audio for transcription to S3: {audio_path}")
-                        audio_s3_key = s3_service.upload_recording(audio_path, meeting_id, "audio_transcription")
-                        if audio_s3_key:
-                            s3_keys['audio_transcription'] = f"s3://{s3_service.bucket_name}/{audio_s3_key}"
-                            logger.info(f"✅ Audio for transcription uploaded to S3: {s3_keys['audio_transcription']}")
-                        else:
-                            logger.warning("Failed to upload audio for transcription to S3")
+                # Upload video only (if separate)
+                elif 'video_only' in files:
+                    video_path = files['video_only']['path']
+                    logger.info(f"Uploading video-only to S3: {video_path}")
+                    video_s3_key = s3_service.upload_recording(video_path, meeting_id, "video_only")
+                    if video_s3_key:
+                        s3_keys['video_only'] = f"s3://{s3_service.bucket_name}/{video_s3_key}"
+                        logger.info(f"✅ Video-only uploaded to S3: {s3_keys['video_only']}")
+                    else:
+                        logger.warning("Failed to upload video-only to S3")
                 
-                # Add to local database with all S3 paths
-                if s3_path:
-                    metadata = {
-                        "meeting_id": meeting.meeting_id,
-                        "title": meeting.title,
-                        "platform": meeting.platform,
-                        "export_timestamp": meeting_data.get("export_timestamp")
-                    }
-                    
-                    # Add recording S3 paths to metadata
-                    if recording_info and 's3_keys' in locals():
-                        metadata['recordings'] = s3_keys
-                    
-                    self.meeting_database.add_meeting(
-                        meeting_url=meeting.meeting_url,
-                        s3_path=s3_path,
-                        metadata=metadata
-                    )
-                    logger.info(f"✅ Meeting data saved to database with S3 references")
-                else:
-                    logger.warning("S3 transcription upload failed")
-            else:
-                logger.info("S3 service not enabled. Saving transcription JSON locally only.")
-                # Save JSON locally as backup
-                json_dir = Path("transcripts/json")
-                json_dir.mkdir(parents=True, exist_ok=True)
-                json_filename = f"{meeting.meeting_id}_{meeting_data['export_timestamp'].replace(':', '-')}.json"
-                json_path = json_dir / json_filename
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(meeting_data, f, indent=2, ensure_ascii=False)
-                logger.info(f"Transcription saved locally: {json_path}")
+                # Upload audio only
+                if 'audio_only' in files:
+                    audio_path = files['audio_only']['path']
+                    logger.info(f"Uploading audio-only to S3: {audio_path}")
+                    audio_s3_key = s3_service.upload_recording(audio_path, meeting_id, "audio_only")
+                    if audio_s3_key:
+                        s3_keys['audio_only'] = f"s3://{s3_service.bucket_name}/{audio_s3_key}"
+                        logger.info(f"✅ Audio-only uploaded to S3: {s3_keys['audio_only']}")
+                    else:
+                        logger.warning("Failed to upload audio-only to S3")
                 
-                # Save speaking tracker data locally
-                if speaking_data:
-                    speaking_filename = f"{meeting.meeting_id}_speaking_{meeting_data['export_timestamp'].replace(':', '-')}.json"
-                    speaking_path = json_dir / speaking_filename
-                    with open(speaking_path, 'w', encoding='utf-8') as f:
-                        json.dump(speaking_data, f, indent=2, ensure_ascii=False)
-                    logger.info(f"Speaking data saved locally: {speaking_path}")
+                # Upload audio for transcription (if separate)
+                elif 'audio_for_transcription' in files:
+                    audio_path = files['audio_for_transcription']['path']
+                    logger.info(f"Uploading audio for transcription to S3: {audio_path}")
+                    audio_s3_key = s3_service.upload_recording(audio_path, meeting_id, "audio_transcription")
+                    if audio_s3_key:
+                        s3_keys['audio_transcription'] = f"s3://{s3_service.bucket_name}/{audio_s3_key}"
+                        logger.info(f"✅ Audio for transcription uploaded to S3: {s3_keys['audio_transcription']}")
+                    else:
+                        logger.warning("Failed to upload audio for transcription to S3")
+            
+            # Add to local database with all S3 paths
+            if s3_path:
+                metadata = {
+                    "meeting_id": meeting.meeting_id,
+                    "title": meeting.title,
+                    "platform": meeting.platform,
+                    "export_timestamp": meeting_data.get("export_timestamp")
+                }
                 
-                # Note: Recording files are already saved locally in recordings/ directory
-                if recording_info and recording_info.get('files'):
-                    logger.info("Recording files saved locally:")
-                    for file_type, file_info in recording_info['files'].items():
-                        logger.info(f"  - {file_type}: {file_info.get('path')}")
-
+                # Add recording S3 paths to metadata
+                if recording_info and 's3_keys' in locals():
+                    metadata['recordings'] = s3_keys
+                
+                self.meeting_database.add_meeting(
+                    meeting_url=meeting.meeting_url,
+                    s3_path=s3_path,
+                    metadata=metadata
+                )
+                logger.info(f"✅ Meeting data saved to database with S3 references")
+            else:
+                logger.warning("S3 transcription upload failed")
+        else:
+            logger.info("S3 service not enabled. Saving transcription JSON locally only.")
+            # Save JSON locally as backup
+            json_dir = Path("transcripts/json")
+            json_dir.mkdir(parents=True, exist_ok=True)
+            json_filename = f"{meeting.meeting_id}_{meeting_data['export_timestamp'].replace(':', '-')}.json"
+            json_path = json_dir / json_filename
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(meeting_data, f, indent=2, ensure_ascii=False)
+            logger.info(f"Transcription saved locally: {json_path}")
             
-            # Reset metadata for next meeting
-            self.transcription_service.reset_metadata()
+            # Save speaking tracker data locally
+            if speaking_data:
+                speaking_filename = f"{meeting.meeting_id}_speaking_{meeting_data['export_timestamp'].replace(':', '-')}.json"
+                speaking_path = json_dir / speaking_filename
+                with open(speaking_path, 'w', encoding='utf-8') as f:
+                    json.dump(speaking_data, f, indent=2, ensure_ascii=False)
+                logger.info(f"Speaking data saved locally: {speaking_path}")
             
-        except Exception as export_error:
-            logger.error(f"Error exporting meeting data: {export_error}")
+            # Note: Recording files are already saved locally in recordings/ directory
+            if recording_info and recording_info.get('files'):
+                lines = ["Recording files saved locally:"]
+                lines.extend(
+                    f"  - {file_type}: {file_info.get('path')}"
+                    for file_type, file_info in recording_info['files'].items()
+                )
+                logger.info("\n".join(lines))
+    
+    def _get_custom_s3_service(self, s3_config: dict) -> S3Service:
+        """Return a cached S3Service for a manual-join S3 configuration."""
+        bucket_name = s3_config.get('bucket_name')
+        access_key_id = s3_config.get('access_key_id')
+        secret_access_key = s3_config.get('secret_access_key')
+        region = s3_config.get('region', 'us-east-1')
+        key = hashlib.sha256(
+            "\0".join(str(v) for v in (bucket_name, access_key_id, secret_access_key, region)).encode()
+        ).hexdigest()
         
-        # Close context and cleanup
-        try:
-            await context.close()
-        except:
-            pass
+        with self._custom_s3_lock:
+            s3_service = self._custom_s3_services.get(key)
+            if s3_service is not None:
+                self._custom_s3_services.move_to_end(key)
+                return s3_service
         
-        if meeting.meeting_url in self.active_contexts:
-            del self.active_contexts[meeting.meeting_url]
+        # Building the boto client is slow; do it without blocking other uploads
+        s3_service = S3Service(
+            bucket_name=bucket_name,
+            access_key_id=access_key_id,
+            secret_access_key=secret_access_key,
+            region=region
+        )
+        
+        with self._custom_s3_lock:
+            # Another upload may have built the same service meanwhile
+            existing = self._custom_s3_services.get(key)
+            if existing is not None:
+                self._custom_s3_services.move_to_end(key)
+                return existing
+            self._custom_s3_services[key] = s3_service
+            if len(self._custom_s3_services) > _CUSTOM_S3_CACHE_SIZE:
+                self._custom_s3_services.popitem(last=False)
+        return s3_service
+    
+    async def _stop_recording(self, platform: str, meeting: MeetingDetails) -> Optional[dict]:
+        """Stop the meeting's recording, if one is active."""
+        try:
+            recording_service = None
+            if platform == "teams":
+                recording_service = self.teams_handler.pop_recording(meeting.meeting_id)
+            elif platform == "google_meet":
+                recording_service = self.meet_handler.recording_service
+            
+            if recording_service and recording_service.is_recording:
+                logger.info("Stopping recording...")
+                recording_info = await recording_service.stop_recording()
+                if recording_info:
+                    logger.info(f"Recording saved: {recording_info.get('recording_id')}")
+                    logger.info("Files: %s", ", ".join(recording_info.get('files', {})))
+                return recording_info
+        except Exception as e:
+            logger.warning(f"Error stopping recording: {e}")
+        return None
+    
+    async def _stop_speaking_tracker(self, platform: str, meeting: MeetingDetails) -> Optional[dict]:
+        """Stop the meeting's speaking tracker and collect its data (Teams only for now)."""
+        try:
+            speaking_tracker = (
+                self.teams_handler.pop_speaking_tracker(meeting.meeting_id) if platform == "teams" else None
+            )
+            if speaking_tracker:
+                logger.info("Stopping speaking tracker...")
+                speaking_data = await speaking_tracker.stop()
+                segment_count = len(speaking_data.get('speaking_segments', []))
+                event_count = len(speaking_data.get('participant_events', []))
+                logger.info(f"✅ Speaking tracker stopped: {segment_count} segments, {event_count} events")
+                return speaking_data
+        except Exception as e:
+            logger.warning(f"Error stopping speaking tracker: {e}")
+        return None
     
     async def cleanup_all(self) -> None:
         """Clean up all active meeting contexts."""
         logger.info("Cleaning up all active meeting contexts...")
         
-        for url, context in list(self.active_contexts.items()):
-            logger.info(f"Closing active meeting context for {url}")
-            await context.close()
-            del self.active_contexts[url]
+        # Snapshot once: closing a context lets its monitor's cleanup mutate the
+        # dict. Teams meetings in one tenant share a context; close each once.
+        urls_by_context: dict[BrowserContext, list[str]] = {}
+        for url, context in self.active_contexts.items():
+            urls_by_context.setdefault(context, []).append(url)
+        self.active_contexts.clear()
+        for urls in urls_by_context.values():
+            logger.info(f"Closing active meeting context for {', '.join(urls)}")
+        
+        # Close all contexts concurrently; one failure must not block the rest
+        results = await asyncio.gather(
+            *(context.close() for context in urls_by_context),
+            return_exceptions=True
+        )
+        for urls, result in zip(urls_by_context.values(), results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error closing context for {', '.join(urls)}: {result}")
         
         # Stop transcription service
         self.transcription_service.stop_transcription()
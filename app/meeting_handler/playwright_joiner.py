@@ -5,6 +5,10 @@ Refactored version that uses the MeetingOrchestrator for platform-specific handl
 This is the new main entry point that replaces the old monolithic approach.
 
 Usage:
+    async with MeetingJoiner() as joiner:
+        await joiner.join_meeting(meeting)
+
+    # or, for a joiner that outlives a single block:
     joiner = MeetingJoiner()
     await joiner.start()
     await joiner.join_meeting(meeting)
@@ -15,7 +19,7 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from playwright.async_api import (
     async_playwright,
@@ -25,7 +29,7 @@ from playwright.async_api import (
 )
 
 from app.config import settings, get_logger
-from app.models import MeetingDetails, MeetingPlatform
+from app.models import MeetingDetails
 from .meeting_orchestrator import MeetingOrchestrator
 
 
@@ -42,15 +46,30 @@ class MeetingJoiner:
     - Better separation of concerns
     """
 
-    def __init__(self) -> None:
+    def __init__(self, on_meeting_finished: Optional[Callable[[MeetingDetails], None]] = None) -> None:
+        """
+        Args:
+            on_meeting_finished: Called with a meeting once it has ended and been
+                cleaned up, or once its join has failed or been skipped
+        """
+        self._on_meeting_finished = on_meeting_finished
         self._playwright = None
         self._browser: Optional[Browser] = None
         self._orchestrator: Optional[MeetingOrchestrator] = None
+        # Snapshot of enabled platform values; settings are not reloaded at runtime
+        self._enabled_platforms = frozenset(p.value for p in settings.enabled_platforms)
 
         # Use a persistent user data directory so the user can log in once
         # and re-use their authenticated browser profile.
         # self._user_data_dir = Path(".playwright_user_data").resolve()  # UNUSED - commented out
 
+    async def __aenter__(self) -> MeetingJoiner:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
     @property
     def is_running(self) -> bool:
         """Return True if the browser is currently available."""
@@ -68,7 +87,10 @@ class MeetingJoiner:
         # We use launch() instead of launch_persistent_context to allow multiple isolated contexts
         # Added stealth arguments to avoid 403 Forbidden / 429 Too Many Requests
         self._browser = await self._playwright.chromium.launch(
-            headless=False,
+            # The "chromium" channel runs the new headless mode (the full browser
+            # without a window) rather than the stripped-down headless shell
+            headless=settings.bot.headless,
+            channel="chromium" if settings.bot.headless else None,
             ignore_default_args=["--enable-automation"],  # Critical for stealth
             args=[
                 # Media capture flags
@@ -86,12 +108,23 @@ class MeetingJoiner:
                 
                 # Force audio playback even in headless/background
                 "--autoplay-policy=no-user-gesture-required",
-                "--disable-features=PreloadMediaEngagementData,MediaEngagementBypassAutoplayPolicies",
+                # Chromium honours only the last --disable-features, so keep them all here
+                "--disable-features=PreloadMediaEngagementData,MediaEngagementBypassAutoplayPolicies,"
+                "TranslateUI,OptimizationHints,MediaRouter",
                 
                 # Prevent audio suspension in background tabs (CRITICAL)
                 "--disable-background-media-suspend",
                 "--disable-backgrounding-occluded-windows",
                 "--disable-renderer-backgrounding",
+                "--disable-background-timer-throttling",
+                
+                # Subsystems a meeting bot never uses (memory/CPU per browser)
+                "--disable-accelerated-2d-canvas",
+                "--disable-background-networking",
+                "--disable-component-update",
+                "--disable-default-apps",
+                "--disable-sync",
+                "--metrics-recording-only",
                 
                 # Stealth flags
                 "--disable-blink-features=AutomationControlled",
@@ -110,7 +143,9 @@ class MeetingJoiner:
         )
         
         # Initialize orchestrator
-        self._orchestrator = MeetingOrchestrator(self._browser)
+        self._orchestrator = MeetingOrchestrator(self._browser, self._on_meeting_finished)
+        # Fill the context pools now, before the first meeting needs one
+        self._orchestrator.warm_up(self._enabled_platforms)
         
         logger.info("Playwright meeting joiner started.")
 
@@ -145,15 +180,26 @@ class MeetingJoiner:
             logger.warning(f"Cannot join meeting {meeting.title}: no meeting URL.")
             return
 
-        if MeetingPlatform(meeting.platform.value) not in settings.enabled_platforms:
+        if meeting.platform.value not in self._enabled_platforms:
             logger.warning(
                 f"Platform {meeting.platform.value} is disabled; "
                 f"skipping auto-join for meeting {meeting.title}."
             )
+            meeting.is_joined = False
+            self._meeting_finished(meeting)
             return
 
-        if self._browser is None:
-            await self.start()
+        try:
+            if self._browser is None:
+                await self.start()
 
-        # Delegate to orchestrator
-        await self._orchestrator.join_meeting(meeting)
+            # Delegate to orchestrator
+            await self._orchestrator.join_meeting(meeting)
+        finally:
+            # Successful joins are reported by the orchestrator after cleanup
+            if not meeting.is_joined:
+                self._meeting_finished(meeting)
+    
+    def _meeting_finished(self, meeting: MeetingDetails) -> None:
+        if self._on_meeting_finished:
+            self._on_meeting_finished(meeting)
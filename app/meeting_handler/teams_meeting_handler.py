@@ -12,8 +12,11 @@ Handles all Microsoft Teams meeting operations including:
 from __future__ import annotations
 
 import asyncio
+import json
+import time
 from pathlib import Path
 from typing import Optional
+from urllib.parse import parse_qs, urlparse
 
 from playwright.async_api import (
     Browser,
@@ -28,16 +31,28 @@ from app.transcription.service import TranscriptionService
 from app.recording import RecordingService
 from app.storage import S3Service
 from app.speaker_detection import SpeakingTracker
+from .browser_utils import block_heavy_assets, first_match, release_meeting, to_dom_matcher
 from .teams_scripts import (
     TEAMS_SELECTORS,
-    TEAMS_CAPTION_OBSERVER_JS,
+    TEAMS_ADMISSION_WATCH_CALL_JS,
+    TEAMS_CLICK_CAPTIONS_MENU_ITEM_JS,
+    TEAMS_JOIN_BUTTON_SELECTOR,
+    TEAMS_MUTE_BEFORE_JOIN_JS,
+    TEAMS_PAGE_INIT_JS,
+    TEAMS_PAGE_READY_SELECTOR,
+    TEAMS_PREJOIN_READY_SELECTOR,
     get_selectors_for,
 )
-from datetime import datetime
 
 
 logger = get_logger("teams_handler")
 
+# Caption container or a "Turn off captions" control: either means captions are on
+_CAPTIONS_ON_MATCHER = to_dom_matcher(
+    [*get_selectors_for("caption_container"), *get_selectors_for("captions_on_indicator")]
+)
+_MORE_ACTIONS_MATCHERS = tuple(to_dom_matcher([sel]) for sel in get_selectors_for("more_actions"))
+
 
 class TeamsMeetingHandler:
     """Handler for Microsoft Teams meetings."""
@@ -45,8 +60,16 @@ class TeamsMeetingHandler:
     def __init__(self, browser: Browser, transcription_service: TranscriptionService, s3_service: S3Service = None):
         self.browser = browser
         self.transcription_service = transcription_service
-        self.recording_service = RecordingService(s3_service=s3_service)
-        self.speaking_tracker: SpeakingTracker | None = None  # Will be set per meeting
+        self.s3_service = s3_service
+        # Meetings in a tenant share a context, so recording and speaker
+        # tracking state is kept per meeting (keyed by meeting_id)
+        self._recordings: dict[str, RecordingService] = {}
+        self._speaking_trackers: dict[str, SpeakingTracker] = {}
+        # One context per tenant; meetings in the same tenant open sibling pages
+        self._contexts_by_tenant: dict[str, BrowserContext] = {}
+        self._context_created_at: dict[BrowserContext, float] = {}  # monotonic seconds
+        # Strong references to caption restore tasks; discarded when they finish
+        self._background_tasks: set[asyncio.Task] = set()
         logger.info("TeamsMeetingHandler initialized with recording service")
     
     async def join_meeting(self, meeting: MeetingDetails, active_contexts: dict[str, BrowserContext]) -> None:
@@ -63,27 +86,26 @@ class TeamsMeetingHandler:
         7. Enable captions and start transcription
         """
 
-        # VIDEO RECORDING STARTS HERE - capture timestamp for sync
-        import time
-        video_start_timestamp_ms = int(time.time() * 1000)
-        
-        context = await self.browser.new_context(
-            permissions=["microphone", "camera"],
-            ignore_https_errors=True,
-            record_video_dir="recordings/temp",  # Temporary dir, will be moved
-            record_video_size={"width": 1920, "height": 1080}
-        )
+        context = await self._get_tenant_context(meeting.meeting_url)
         active_contexts[meeting.meeting_url] = context
         
-        # Set context for recording service WITH video start timestamp
-        self.recording_service.set_context(context)
-        self.recording_service.set_video_start_timestamp(video_start_timestamp_ms)
-        logger.info(f"Video recording started at context creation: {video_start_timestamp_ms}")
-        
+        # VIDEO RECORDING STARTS HERE - each page records its own video from creation
+        video_start_timestamp_ms = int(time.time() * 1000)
         page = await context.new_page()
         
+        # This meeting's recording service, WITH video start timestamp
+        recording_service = RecordingService(s3_service=self.s3_service)
+        recording_service.set_context(context)
+        recording_service.set_video_start_timestamp(video_start_timestamp_ms)
+        self._recordings[meeting.meeting_id] = recording_service
+        logger.info(f"Video recording started at page creation: {video_start_timestamp_ms}")
+        
         # Hook console logs for debugging
-        page.on("console", lambda msg: logger.debug(f"TEAMS CONSOLE: {msg.text}"))
+        page.on("console", lambda msg: logger.debug("TEAMS CONSOLE: %s", msg.text))
+        
+        # Caption observer, admission watcher and meeting-state reader are in
+        # place from the first document, registered in one round trip
+        await page.add_init_script(TEAMS_PAGE_INIT_JS)
         
         try:
             # --- Step 1: Navigate to meeting URL ---
@@ -99,90 +121,87 @@ class TeamsMeetingHandler:
             await page.goto(web_url, wait_until="domcontentloaded", timeout=60000)
             logger.info("Teams meeting page loaded")
             
-            # Wait for page to stabilize
-            await asyncio.sleep(2)
-
+            # domcontentloaded returns before the SPA renders; block on our own
+            # condition (pre-join UI or a prompt in front of it), not the network's
+            try:
+                await page.wait_for_selector(TEAMS_PAGE_READY_SELECTOR, state="visible", timeout=30000)
+            except PlaywrightTimeoutError:
+                logger.warning("Teams pre-join UI not rendered after 30s, continuing anyway...")
+            
+            # --- Step 2: Handle "Continue on this browser" prompt ---
+            await self._continue_in_browser(page)
             
-            await asyncio.sleep(20)
             # --- Step 3: Handle permission dialog early (before name entry) ---
             await self._handle_permission_dialog(page)
             
             # --- Step 3.5: Dismiss any overlay dialogs blocking the pre-join screen ---
             await self._dismiss_overlay_dialogs(page)
             
-            # Wait for pre-join screen to fully load
-            logger.info("Waiting for pre-join screen to load...")
-            await asyncio.sleep(3)
-                        
             # Wait for either name input OR join button to appear
+            logger.info("Waiting for pre-join screen to load...")
             try:
-                await page.wait_for_selector(
-                    'input[placeholder*="name"], button:has-text("Join now")',
-                    timeout=1000
-                )
+                await page.wait_for_selector(TEAMS_PREJOIN_READY_SELECTOR, state="visible", timeout=10000)
                 logger.info("Pre-join screen detected")
-            except:
+            except PlaywrightTimeoutError:
                 logger.warning("Pre-join screen elements not detected, continuing anyway...")
-            
-            # Try dismissing overlays again after waiting
-            await self._dismiss_overlay_dialogs(page)
-            
-            await asyncio.sleep(2)
+                # Something may still be covering the pre-join screen
+                await self._dismiss_overlay_dialogs(page)
             
             # --- Step 4: Enter display name ---
             bot_name = meeting.title or settings.bot.teams_bot_name
             name_entered = await self._enter_name(page, bot_name)
             
             if not name_entered:
-                # Try again with more wait
-                logger.info("Retrying name entry after additional wait...")
-                await asyncio.sleep(1)
+                logger.info("Retrying name entry...")
                 await self._enter_name(page, bot_name)
             
             # --- Step 5: Mute microphone and camera before joining ---
             await self._mute_before_join(page)
-
-            # Small wait after muting
-            await asyncio.sleep(1)
                         
             # --- Step 6: Click "Join now" button ---
             join_success = await self._click_join(page)
             if not join_success:
                 logger.warning("First join attempt failed, retrying...")
-                await asyncio.sleep(2)
                 join_success = await self._click_join(page)
             
-            await asyncio.sleep(2)
-            
             # --- Step 7: Wait for admission (lobby handling) ---
             admitted = await self._wait_for_admission(page, timeout=600)
             
             if not admitted:
                 logger.error(f"Failed to join Teams meeting: {meeting.title}")
-                await context.close()
-                if meeting.meeting_url in active_contexts:
-                    del active_contexts[meeting.meeting_url]
+                await self._discard_meeting_state(meeting.meeting_id)
+                await release_meeting(active_contexts, meeting.meeting_url, context, page)
                 return
             
             logger.info(f"✅ Successfully joined Teams meeting: {meeting.title}")
             
             # --- Step 8: Post-join setup ---
-            # Enable captions and start transcription
-            await self._start_transcription(page, meeting)
-            
-            # Start automatic recording
-            logger.info("Starting automatic recording for Teams...")
-            recording_started = await self.recording_service.start_recording(page, meeting)
-            if recording_started:
+            # Captions/transcription, recording and speaker tracking are
+            # independent; start them together rather than one after another
+            logger.info("Starting transcription, recording and speaking tracker for Teams...")
+            speaking_tracker = SpeakingTracker(page, verbose_logging=False)
+            self._speaking_trackers[meeting.meeting_id] = speaking_tracker
+            # A failing sibling must not cancel the others or undo the join
+            transcription, recording, tracker = await asyncio.gather(
+                self._start_transcription(page, meeting),
+                recording_service.start_recording(page, meeting),
+                speaking_tracker.start(),
+                return_exceptions=True,
+            )
+            
+            if isinstance(recording, BaseException):
+                logger.warning(f"⚠️ Recording failed to start: {recording}")
+            elif recording:
                 logger.info("✅ Recording started successfully")
             else:
                 logger.warning("⚠️ Recording failed to start")
-            
-            # Start speaking tracker for speaker diarization
-            logger.info("Starting speaking tracker for Teams...")
-            self.speaking_tracker = SpeakingTracker(page, verbose_logging=False)
-            await self.speaking_tracker.start()
-            logger.info("✅ Speaking tracker started")
+            if isinstance(tracker, BaseException):
+                logger.warning(f"⚠️ Speaking tracker failed to start: {tracker}")
+            else:
+                logger.info("✅ Speaking tracker started")
+            # Only transcription is essential to the meeting session
+            if isinstance(transcription, BaseException):
+                raise transcription
             
             return context, page
             
@@ -191,11 +210,118 @@ class TeamsMeetingHandler:
             import traceback
             logger.error(traceback.format_exc())
             
-            await context.close()
-            if meeting.meeting_url in active_contexts:
-                del active_contexts[meeting.meeting_url]
+            await self._discard_meeting_state(meeting.meeting_id)
+            await release_meeting(active_contexts, meeting.meeting_url, context, page)
             return None, None
     
+    def pop_recording(self, meeting_id: str) -> Optional[RecordingService]:
+        """Hand over a meeting's recording service (for stopping) and forget it."""
+        return self._recordings.pop(meeting_id, None)
+    
+    def pop_speaking_tracker(self, meeting_id: str) -> Optional[SpeakingTracker]:
+        """Hand over a meeting's speaking tracker (for stopping) and forget it."""
+        return self._speaking_trackers.pop(meeting_id, None)
+    
+    async def _discard_meeting_state(self, meeting_id: str) -> None:
+        """Stop and forget the recording/tracker of a meeting whose join failed."""
+        recording_service = self.pop_recording(meeting_id)
+        speaking_tracker = self.pop_speaking_tracker(meeting_id)
+        try:
+            if recording_service and recording_service.is_recording:
+                await recording_service.stop_recording()
+            if speaking_tracker:
+                await speaking_tracker.stop()
+        except Exception as e:
+            logger.warning(f"Error discarding Teams meeting state: {e}")
+    
+    async def _get_tenant_context(self, meeting_url: str) -> BrowserContext:
+        """
+        Return the browser context shared by meetings in the same tenant.
+        
+        Contexts are the expensive object (profile, storage, network stack);
+        pages are cheap, so a second meeting in a tenant only opens a new page.
+        """
+        key = self._tenant_key(meeting_url)
+        context = self._contexts_by_tenant.get(key)
+        if context is not None:
+            age = time.monotonic() - self._context_created_at[context]
+            if age < settings.bot.context_max_age_minutes * 60:
+                logger.info(f"Reusing browser context for Teams tenant {key}")
+                return context
+            # Chromium memory grows over a context's lifetime. Retire it: meetings
+            # still on it keep running and it closes with their last page. This
+            # bounds reuse only; a single long meeting is never moved or capped.
+            logger.info(f"Retiring {age / 60:.0f} min old browser context for Teams tenant {key}")
+            del self._contexts_by_tenant[key]
+        
+        context = await self.browser.new_context(
+            permissions=["microphone", "camera"],
+            ignore_https_errors=True,
+            record_video_dir="recordings/temp",  # Temporary dir, will be moved
+            record_video_size={"width": 1920, "height": 1080},
+            storage_state=self._storage_state_path()
+        )
+        if settings.bot.block_assets:
+            await block_heavy_assets(context)
+        
+        self._contexts_by_tenant[key] = context
+        self._context_created_at[context] = time.monotonic()
+        context.on("close", lambda _: self._forget_context(key, context))
+        return context
+    
+    def _forget_context(self, key: str, context: BrowserContext) -> None:
+        """Drop a closed context from the tenant map (unless already replaced)."""
+        self._context_created_at.pop(context, None)
+        if self._contexts_by_tenant.get(key) is context:
+            del self._contexts_by_tenant[key]
+    
+    @staticmethod
+    def _tenant_key(meeting_url: str) -> str:
+        """
+        Derive the tenant a Teams meeting belongs to.
+        
+        Meeting links carry the tenant id in the ``context`` query parameter
+        (``{"Tid": "...", "Oid": "..."}``); fall back to the host otherwise.
+        """
+        parsed = urlparse(meeting_url)
+        for raw in parse_qs(parsed.query).get("context", []):
+            try:
+                tenant_id = json.loads(raw).get("Tid")
+            except (ValueError, AttributeError):
+                continue
+            if tenant_id:
+                return tenant_id
+        return parsed.netloc.lower()
+    
+    async def _continue_in_browser(self, page: Page) -> None:
+        """Click "Continue on this browser" if Teams offers the desktop app first."""
+        candidates = [page.locator(sel) for sel in get_selectors_for("continue_browser")]
+        continue_btn = candidates[0]
+        for candidate in candidates[1:]:
+            continue_btn = continue_btn.or_(candidate)
+        continue_btn = continue_btn.first
+        
+        try:
+            if not await continue_btn.is_visible():
+                return
+            await continue_btn.click(timeout=5000)
+            logger.info("✅ Clicked 'Continue on this browser'")
+            await page.wait_for_selector(TEAMS_PREJOIN_READY_SELECTOR, state="visible", timeout=30000)
+        except PlaywrightTimeoutError:
+            logger.warning("Pre-join screen slow to appear after 'Continue on this browser'")
+        except Exception as e:
+            logger.warning(f"Error handling 'Continue on this browser': {e}")
+    
+    def _storage_state_path(self) -> Optional[str]:
+        """Return the configured signed-in storage state file, if it exists."""
+        path = settings.bot.teams_storage_state
+        if not path:
+            return None
+        if not Path(path).is_file():
+            logger.warning(f"Teams storage state not found: {path}; joining anonymously")
+            return None
+        return path
+    
     async def _dismiss_overlay_dialogs(self, page: Page) -> None:
         """Dismiss any overlay dialogs that may be blocking the pre-join screen."""
         logger.info("Checking for overlay dialogs to dismiss...")
@@ -223,23 +349,23 @@ class TeamsMeetingHandler:
             for selector in close_button_selectors:
                 try:
                     close_btn = page.locator(selector).first
-                    if await close_btn.count() > 0 and await close_btn.is_visible(timeout=500):
+                    if await close_btn.is_visible():
                         await close_btn.click(timeout=2000)
                         logger.info(f"✅ Dismissed dialog using: {selector}")
                         await asyncio.sleep(0.5)
                         break
-                except:
+                except Exception:
                     continue
             
             # Method 3: Click outside any overlay to dismiss
             try:
                 overlay = page.locator('.ui-dialog__overlay, [class*="overlay"]').first
-                if await overlay.count() > 0 and await overlay.is_visible(timeout=500):
+                if await overlay.is_visible():
                     # Press Escape again
                     await page.keyboard.press("Escape")
                     await asyncio.sleep(0.5)
-            except:
-                pass
+            except Exception as e:
+                logger.debug(f"Overlay escape check failed: {e}")
             
             logger.info("Overlay check complete")
             
@@ -251,17 +377,23 @@ class TeamsMeetingHandler:
         logger.info(f"Looking for name input field to enter: {bot_name}")
 
         try:
-            # Wait for the name input to appear
-            input_field = page.locator('input[placeholder="Type your name"]')
+            # Race all known name-input variants; resolves on whichever renders first
+            candidates = [page.locator(sel) for sel in get_selectors_for("name_input")]
+            input_field = candidates[0]
+            for candidate in candidates[1:]:
+                input_field = input_field.or_(candidate)
+            input_field = input_field.first
             await input_field.wait_for(state="visible", timeout=5000)
 
-            # Focus and type name
-            await input_field.click()
-            await page.wait_for_timeout(500)
+            # fill() sets the value and dispatches input/change in one step
+            await input_field.fill(bot_name)
 
-            # Clear and type using keyboard (most reliable for Teams)
-            await input_field.fill("")
-            await page.keyboard.type(bot_name, delay=50)
+            if await input_field.input_value() != bot_name:
+                # Fall back to real keystrokes if the field did not take the value
+                logger.info("Name not set by fill(), typing it instead...")
+                await input_field.click()
+                await input_field.fill("")
+                await page.keyboard.type(bot_name, delay=50)
 
             logger.info(f"✅ Entered bot name: {bot_name}")
             return True
@@ -274,89 +406,36 @@ class TeamsMeetingHandler:
         """Ensure microphone and camera are OFF before joining the meeting."""
         logger.info("Ensuring microphone and camera are muted before joining...")
         
-        # --- Turn off Camera ---
-        await self._turn_off_camera(page)
-        
-        # --- Turn off Microphone ---
-        await self._turn_off_mic(page)
-        
-        await asyncio.sleep(1)
-    
-    async def _turn_off_camera(self, page: Page) -> None:
-        """Turn off camera in Teams pre-join screen using specific switch element."""
-        logger.info("Attempting to turn off camera...")
-        
         try:
-            # Use the specific switch element provided by user
-            result = await page.evaluate("""
-                () => {
-                    // Look for the specific camera switch with data-tid="toggle-video"
-                    const cameraSwitch = document.querySelector('[data-tid="toggle-video"]');
-                    if (cameraSwitch) {
-                        const isChecked = cameraSwitch.checked;
-                        if (isChecked) {
-                            // Camera is ON, click to turn OFF
-                            cameraSwitch.click();
-                            return 'clicked_camera_switch';
-                        } else {
-                            // Camera is already OFF
-                            return 'already_off';
-                        }
-                    }
-                    return 'not_found';
-                }
-            """)
-            
-            logger.info(f"Camera toggle result: {result}")
-            
-            if result == 'clicked_camera_switch':
+            # Both pre-join switches are handled in a single evaluate
+            result = await page.evaluate(TEAMS_MUTE_BEFORE_JOIN_JS)
+            logger.info(f"Camera/mic toggle result: {result}")
+            
+            for device in ("camera", "mic"):
+                state = result.get(device)
+                if state == 'clicked':
+                    logger.info(f"✅ {device.capitalize()} turned OFF")
+                elif state == 'already_off':
+                    logger.info(f"{device.capitalize()} already OFF")
+                else:
+                    logger.warning(f"{device.capitalize()} switch not found")
+            
+            if 'clicked' in result.values():
+                # Let the switch animation settle before clicking Join
                 await asyncio.sleep(0.5)
-                logger.info("✅ Camera turned OFF")
-            elif result == 'already_off':
-                logger.info("Camera already OFF")
-            else:
-                logger.warning("Camera switch not found")
                 
         except Exception as e:
-            logger.warning(f"Error turning off camera: {e}")
-    
-    async def _turn_off_mic(self, page: Page) -> None:
-        """Turn off microphone in Teams pre-join screen."""
-        logger.info("Attempting to turn off microphone...")
-        
-        try:
-            # Find the mic toggle checkbox and uncheck it if it's checked
-            await page.evaluate("""
-                () => {
-                    const micToggle = document.querySelector('input[data-tid="toggle-mute"]');
-                    if (micToggle && micToggle.checked) {
-                        micToggle.click();
-                    }
-                }
-            """)
-            
-            logger.info("✅ Mic turned off")
-            await asyncio.sleep(0.5)
-            
-        except Exception as e:
-            logger.error(f"Failed to turn off mic: {e}")
+            logger.warning(f"Error turning off camera/mic: {e}")
 
     async def _click_join(self, page: Page) -> bool:
         """Click "Join now" button on Teams pre-join screen."""
         logger.info("Looking for 'Join now' button...")
         
         try:
-            # Method 1: Use data-tid attribute (most reliable for Teams)
-            join_button = page.locator('button[data-tid="prejoin-join-button"]')
-            
-            # Wait for button to be enabled and visible
+            # One wait races every join button variant; click() itself
+            # waits for the button to become enabled
+            join_button = page.locator(TEAMS_JOIN_BUTTON_SELECTOR).first
             await join_button.wait_for(state="visible", timeout=10000)
-            
-            # Check if button is disabled
-            if await join_button.is_disabled():
-                logger.warning("Join button is disabled, waiting for it to be enabled...")
-                await join_button.wait_for(state="attached", timeout=5000)
-            
             await join_button.click()
             logger.info("✅ Clicked 'Join now' button")
             return True
@@ -370,48 +449,38 @@ class TeamsMeetingHandler:
         logger.info("Checking for permission dialog...")
 
         try:
-            # Small wait for dialog animation
-            await page.wait_for_timeout(1000)
-
             # Priority order: Try to ALLOW device access first (needed for audio capture)
             # The bot will mute mic/camera in _mute_before_join() anyway
-            allow_button_texts = [
-                "Allow",
-                "Allow devices", 
-                "Allow access",
-            ]
+            # ("Allow" also matches "Allow devices" / "Allow access")
+            allow_btn = page.get_by_role("button", name="Allow").first
 
-            for text in allow_button_texts:
-                btn = page.get_by_role("button", name=text)
-                try:
-                    await btn.first.wait_for(state="visible", timeout=2000)
-                    logger.info(f"Found 'Allow' permission button: '{text}'")
-                    await btn.first.click()
-                    logger.info(f"✅ Clicked '{text}' - device access granted for audio capture")
-                    await page.wait_for_timeout(2000)
-                    return True
-                except Exception:
-                    pass
+            # Fallback: "Continue without" works, but audio capture may not
+            fallback_text = "Continue without audio or video"
+            fallback_btn = page.get_by_role("button", name=fallback_text).first
 
-            # Fallback: If no "Allow" button found, check for "Continue without" 
-            # but log a warning since audio capture may not work
-            fallback_texts = [
-                "Continue without audio or video",
-            ]
+            # One wait for whichever prompt shows up, instead of probing each in turn
+            try:
+                await allow_btn.or_(fallback_btn).first.wait_for(state="visible", timeout=2000)
+            except PlaywrightTimeoutError:
+                logger.info("No permission dialog found (or already dismissed)")
+                return True
 
-            for text in fallback_texts:
-                btn = page.get_by_role("button", name=text)
-                try:
-                    await btn.first.wait_for(state="visible", timeout=2000)
-                    logger.warning(f"⚠️ Only found '{text}' button - audio capture may not work!")
-                    logger.warning("Consider ensuring browser has device permissions.")
-                    await btn.first.click()
-                    await page.wait_for_timeout(2000)
-                    return True
-                except Exception:
-                    pass
+            if await allow_btn.is_visible():
+                btn = allow_btn
+                logger.info("Found 'Allow' permission button")
+                await btn.click()
+                logger.info("✅ Clicked 'Allow' - device access granted for audio capture")
+            else:
+                btn = fallback_btn
+                logger.warning(f"⚠️ Only found '{fallback_text}' button - audio capture may not work!")
+                logger.warning("Consider ensuring browser has device permissions.")
+                await btn.click()
 
-            logger.info("No permission dialog found (or already dismissed)")
+            # Wait for the dialog to close rather than a fixed delay
+            try:
+                await btn.wait_for(state="hidden", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
             return True
 
         except Exception as e:
@@ -420,80 +489,53 @@ class TeamsMeetingHandler:
 
     
     async def _wait_for_admission(self, page: Page, timeout: int = 600) -> bool:
-        """Wait for admission to Teams meeting (handles lobby)."""
+        """
+        Wait for admission to Teams meeting (handles lobby).
+        
+        A MutationObserver in the page reports the outcome as soon as it
+        renders, instead of probing every selector over CDP on a fixed interval.
+        """
         logger.info(f"Waiting for Teams meeting admission (timeout: {timeout}s)...")
         
-        start_time = datetime.now()
-        last_status_log = start_time
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        retry_delay = 0.5  # Backoff for watcher failures; reset once it runs again
         
-        while (datetime.now() - start_time).total_seconds() < timeout:
-            # First, check if permission dialog appeared
-            try:
-                # Quick check for "Continue without audio or video" button
-                continue_btn = page.locator('button:has-text("Continue without")')
-                if await continue_btn.count() > 0 and await continue_btn.first.is_visible(timeout=1000):
-                    logger.info("⚠️ Permission dialog detected during admission wait!")
-                    await self._handle_permission_dialog(page)
-            except:
-                pass
-            
-            # Check if we're in the meeting (Leave button visible)
-            leave_selectors = get_selectors_for("leave_button")
-            
-            for selector in leave_selectors:
-                try:
-                    leave_btn = page.locator(selector)
-                    if await leave_btn.count() > 0 and await leave_btn.first.is_visible(timeout=1000):
-                        logger.info("✅ Successfully admitted to Teams meeting!")
-                        return True
-                except:
-                    continue
-            
-            # Check for participant list (another indicator of being in meeting)
+        while (remaining := deadline - time.monotonic()) > 0:
             try:
-                roster = page.locator('[data-tid="roster-list"], #roster-list')
-                if await roster.count() > 0 and await roster.first.is_visible(timeout=500):
-                    logger.info("✅ Detected participant list - we're in the meeting!")
-                    return True
-            except:
-                pass
-            
-            # Check for waiting/lobby messages
-            lobby_selectors = get_selectors_for("waiting_lobby")
-            in_lobby = False
-            
-            for selector in lobby_selectors:
-                try:
-                    lobby_msg = page.locator(selector)
-                    if await lobby_msg.count() > 0 and await lobby_msg.first.is_visible(timeout=500):
-                        in_lobby = True
-                        break
-                except:
-                    continue
+                # Re-armed at least every 10s for progress logging
+                state = await page.evaluate(
+                    TEAMS_ADMISSION_WATCH_CALL_JS, int(min(remaining, 10) * 1000)
+                )
+            except Exception as e:
+                # A navigation destroys the execution context; watch the new document
+                if page.is_closed():
+                    logger.error("❌ Page closed while waiting for Teams admission")
+                    return False
+                logger.debug("Admission watcher interrupted: %s", e)
+                await asyncio.sleep(min(retry_delay, remaining))
+                retry_delay = min(retry_delay * 2, 5.0)
+                continue
+            retry_delay = 0.5
             
-            # Log status periodically (every 10 seconds)
-            if (datetime.now() - last_status_log).total_seconds() >= 10:
-                elapsed = int((datetime.now() - start_time).total_seconds())
-                if in_lobby:
-                    logger.info(f"⏳ Still waiting in Teams lobby... ({elapsed}s elapsed)")
-                else:
-                    logger.info(f"⏳ Waiting for Teams meeting admission... ({elapsed}s elapsed)")
-                last_status_log = datetime.now()
-                
+            if state == "admitted":
+                logger.info("✅ Successfully admitted to Teams meeting!")
+                return True
             
-            # Check for denial/error messages
-            denied_selectors = get_selectors_for("entry_denied")
+            if state == "denied":
+                logger.error("❌ Entry denied or meeting ended")
+                return False
             
-            for selector in denied_selectors:
-                try:
-                    denied_msg = page.locator(selector)
-                    if await denied_msg.count() > 0 and await denied_msg.first.is_visible(timeout=500):
-                        logger.error("❌ Entry denied or meeting ended")
-                        return False
-                except:
-                    continue
+            if state == "prompt":
+                logger.info("⚠️ Permission dialog detected during admission wait!")
+                await self._handle_permission_dialog(page)
+                continue
             
-            await asyncio.sleep(2)
+            elapsed = int(time.monotonic() - start_time)
+            if state == "lobby":
+                logger.info(f"⏳ Still waiting in Teams lobby... ({elapsed}s elapsed)")
+            else:
+                logger.info(f"⏳ Waiting for Teams meeting admission... ({elapsed}s elapsed)")
         
         logger.error(f"❌ Timed out waiting for Teams meeting admission ({timeout}s)")
         return False
@@ -506,16 +548,40 @@ class TeamsMeetingHandler:
             # 1. Start transcription service with meeting details
             self.transcription_service.start_transcription(meeting.title, meeting)
             
-            # 2. Expose Python callback to page
-            async def on_transcript(data):
-                speaker = data.get("speaker", "Unknown Speaker")
-                text = data.get("text", "")
-                timestamp = data.get("timestamp")  # ISO timestamp from JS
-                if text:
-                    self.transcription_service.append_transcript(speaker, text, timestamp)
-                    logger.debug(f"Caption: [{speaker}] {text[:50]}...")
-            
-            await page.expose_function("screenAppTranscript", on_transcript)
+            # 2. Expose Python callback to page (the observer delivers captions in batches)
+            # File writes run in a worker thread; the lock keeps batches in order
+            write_lock = asyncio.Lock()
+            
+            async def on_transcript_batch(items):
+                entries = []
+                for data in items:
+                    speaker = data.get("speaker", "Unknown Speaker")
+                    text = data.get("text", "")
+                    timestamp = data.get("timestamp")  # ISO timestamp from JS
+                    if text:
+                        entries.append((speaker, text, timestamp))
+                        logger.debug("Caption: [%s] %.50s...", speaker, text)
+                if entries:
+                    async with write_lock:
+                        await asyncio.to_thread(self.transcription_service.append_transcripts, entries)
+            
+            await page.expose_function("screenAppTranscriptBatch", on_transcript_batch)
+            
+            # Re-enable captions only when they go missing, instead of polling:
+            # the in-page state watcher reports loss, and a main-frame
+            # navigation may drop them (restore is a no-op if they are on)
+            async def on_caption_lost():
+                logger.info("Caption container not visible, attempting to re-enable...")
+                await self._restore_captions(page)
+            
+            def on_frame_navigated(frame):
+                if frame is page.main_frame:
+                    task = asyncio.create_task(self._restore_captions(page))
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._background_tasks.discard)
+            
+            await page.expose_function("screenAppCaptionLost", on_caption_lost)
+            page.on("framenavigated", on_frame_navigated)
             
             # 3. Enable captions
             captions_enabled = await self._enable_captions(page)
@@ -525,12 +591,7 @@ class TeamsMeetingHandler:
             else:
                 logger.info("Teams captions enabled")
             
-            # 4. Inject caption observer JavaScript
-            await page.evaluate(TEAMS_CAPTION_OBSERVER_JS)
-            logger.info("Teams caption observer injected")
-            
-            # 5. Start background task to ensure captions stay enabled
-            asyncio.create_task(self._caption_monitor(page))
+            # 4. Caption observer was installed as an init script at page creation
             
         except Exception as e:
             logger.error(f"Failed to start Teams transcription: {e}")
@@ -540,98 +601,55 @@ class TeamsMeetingHandler:
         logger.info("Attempting to enable Teams live captions...")
         
         # Check if captions are already on
-        container_selectors = get_selectors_for("caption_container")
-        for selector in container_selectors:
-            try:
-                container = page.locator(selector)
-                if await container.count() > 0 and await container.first.is_visible(timeout=1000):
-                    logger.info("Caption container already visible - captions are on")
-                    return True
-            except:
-                continue
+        try:
+            if await first_match(page, [_CAPTIONS_ON_MATCHER]) >= 0:
+                logger.info("Captions already on")
+                return True
+        except Exception as e:
+            logger.debug(f"Caption container check failed: {e}")
         
         # Open More actions menu and click captions
         more_actions_selectors = get_selectors_for("more_actions")
         
-        for selector in more_actions_selectors:
-            try:
-                more_btn = page.locator(selector)
-                if await more_btn.count() > 0:
-                    await more_btn.first.click(force=True, timeout=3000)
-                    logger.info("Opened 'More actions' menu")
+        try:
+            # One evaluate finds the highest-priority button in the DOM
+            found = await first_match(page, list(_MORE_ACTIONS_MATCHERS), visible=False)
+            if found >= 0:
+                more_btn = page.locator(more_actions_selectors[found])
+                await more_btn.first.click(force=True, timeout=3000)
+                logger.info("Opened 'More actions' menu")
+                # Proceed as soon as the menu renders instead of a fixed 2s sleep
+                try:
+                    await page.locator('[role="menu"]').first.wait_for(state="visible", timeout=2000)
+                except PlaywrightTimeoutError:
+                    pass
+                
+                # Find and click caption option in menu
+                result = await page.evaluate(TEAMS_CLICK_CAPTIONS_MENU_ITEM_JS)
+                
+                if result.get('success'):
+                    logger.info(f"✅ Clicked caption option from More menu: {result.get('found')}")
                     await asyncio.sleep(2)
-                    
-                    # Find and click caption option in menu
-                    result = await page.evaluate("""
-                        () => {
-                            const elements = document.querySelectorAll('[role="menuitem"], [role="menuitemcheckbox"], button');
-                            
-                            for (const el of elements) {
-                                const text = (el.textContent || '').toLowerCase();
-                                const label = (el.getAttribute('aria-label') || '').toLowerCase();
-                                
-                                if ((text.includes('caption') || label.includes('caption')) && 
-                                    !text.includes('turn off') && !label.includes('turn off')) {
-                                    
-                                    const rect = el.getBoundingClientRect();
-                                    if (rect.width > 0 && rect.height > 0) {
-                                        el.click();
-                                        return {success: true, found: el.textContent};
-                                    }
-                                }
-                            }
-                            return {success: false};
-                        }
-                    """)
-                    
-                    if result.get('success'):
-                        logger.info(f"✅ Clicked caption option from More menu: {result.get('found')}")
-                        await asyncio.sleep(2)
-                        return True
-                    
-                    # Close menu if nothing found
-                    await page.keyboard.press("Escape")
-                    await asyncio.sleep(0.5)
-                    break
-            except:
-                continue
+                    return True
+                
+                # Close menu if nothing found
+                await page.keyboard.press("Escape")
+                await asyncio.sleep(0.5)
+        except Exception as e:
+            logger.debug(f"Caption menu attempt failed: {e}")
         
         logger.warning("Could not enable Teams captions - menu options not found")
         return False
     
-    async def _caption_monitor(self, page: Page) -> None:
-        """Background task to periodically check if captions are still enabled."""
-        logger.info("Starting Teams caption monitor...")
+    async def _restore_captions(self, page: Page) -> None:
+        """
+        Re-enable live captions after they were turned off mid-meeting.
         
+        Triggered by the page's caption-loss signal or a main-frame
+        navigation, never by polling.
+        """
         try:
-            while True:
-                if page.is_closed():
-                    break
-                
-                await asyncio.sleep(60)  # Check every minute
-                
-                try:
-                    # Check if caption container is visible
-                    container_selectors = get_selectors_for("caption_container")
-                    
-                    container_visible = False
-                    for selector in container_selectors:
-                        try:
-                            container = page.locator(selector)
-                            if await container.count() > 0 and await container.first.is_visible(timeout=1000):
-                                container_visible = True
-                                break
-                        except:
-                            continue
-                    
-                    if not container_visible:
-                        logger.info("Caption container not visible, attempting to re-enable...")
-                        await self._enable_captions(page)
-                        
-                except Exception as e:
-                    logger.debug(f"Caption monitor check failed: {e}")
-                    
-        except asyncio.CancelledError:
-            logger.debug("Teams caption monitor cancelled")
+            if not await self._enable_captions(page):
+                logger.warning("Could not re-enable Teams captions")
         except Exception as e:
-            logger.error(f"Teams caption monitor error: {e}")
+            logger.debug(f"Caption restore failed: {e}")
@@ -10,6 +10,12 @@ Note: Teams UI is frequently updated by Microsoft, so selectors may need
 periodic maintenance.
 """
 
+import json
+from functools import lru_cache
+
+from .browser_utils import DOM_MATCHER_JS, to_dom_matcher
+
+
 # =============================================================================
 # DOM SELECTORS
 # =============================================================================
@@ -261,14 +267,43 @@ TEAMS_SELECTORS = {
 }
 
 
+# Any of these visible means the pre-join screen is interactive
+TEAMS_PREJOIN_READY_SELECTOR = ", ".join([
+    'input[placeholder*="name"]',
+    'input[data-tid="prejoin-display-name-input"]',
+    'button[data-tid="prejoin-join-button"]',
+    'button:has-text("Join now")',
+])
+
+# Any join button variant; light meetings (teams.live.com) lack the data-tid one
+TEAMS_JOIN_BUTTON_SELECTOR = ", ".join(TEAMS_SELECTORS["join_button"])
+
+# Pre-join screen, or a prompt Teams may show before it
+# (device permissions, or "Continue on this browser" when webjoin is ignored)
+TEAMS_PAGE_READY_SELECTOR = ", ".join([
+    TEAMS_PREJOIN_READY_SELECTOR,
+    'button:has-text("Allow")',
+    'button:has-text("Continue without audio or video")',
+    '[data-tid="joinOnWeb"]',
+    'a:has-text("Continue on this browser")',
+    'button:has-text("Continue on this browser")',
+])
+
+
 # =============================================================================
 # JAVASCRIPT CODE
 # =============================================================================
 
 # JavaScript to observe Teams captions in real-time (supports light meetings)
 # V10: Uses Teams' actual DOM structure - data-tid="author" and data-tid="closed-caption-text"
+# Installed as an init script before navigation: it stays idle until the
+# screenAppTranscriptBatch callback is exposed, and installs only once per document.
+# Captions are buffered and delivered in batches (every 500ms, or sooner when
+# the buffer fills) instead of one exposed-function round trip per caption.
 TEAMS_CAPTION_OBSERVER_JS = """
 (() => {
+    if (window.__teamsCaptionObserverInstalled) return;
+    window.__teamsCaptionObserverInstalled = true;
     console.log("Teams Caption Observer V10 - Using DOM Structure");
     
     const emittedSet = new Set();
@@ -281,6 +316,27 @@ TEAMS_CAPTION_OBSERVER_JS = """
     const COMPLETE_DELAY_MS = 1000;
     const SPEAKER_TIMEOUT_MS = 5000; // Reset to "Participant" if no name seen for 5s
     
+    // Built once; isPersonName/emitCaption run for every caption candidate
+    const SPEECH_WORDS = new Set([
+        'yes', 'no', 'ok', 'okay', 'sure', 'so', 'can', 'you', 'please',
+        'the', 'and', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
+        'will', 'would', 'could', 'should', 'may', 'might', 'must',
+        'what', 'why', 'how', 'when', 'where', 'who', 'which',
+        'this', 'that', 'these', 'those', 'here', 'there',
+        'not', 'but', 'for', 'with', 'from', 'about', 'into',
+        'your', 'my', 'his', 'her', 'its', 'our', 'their',
+        'just', 'like', 'know', 'think', 'want', 'need', 'get',
+        'let', 'see', 'say', 'tell', 'ask', 'make', 'take',
+        'mute', 'unmute', 'leave', 'share', 'camera', 'call',
+        'meeting', 'captions', 'joined', 'left', 'unknown'
+    ]);
+    const SYSTEM_TEXT_RE = /turn on|live captions|captions are turned on|joined the|left the|unknown user/i;
+    
+    // Finished captions waiting to be delivered to Python
+    const pendingTranscripts = [];
+    const FLUSH_INTERVAL_MS = 500;
+    const MAX_BATCH_SIZE = 20;
+    
     // Known speaker names (learned during session)
     const knownSpeakers = new Set();
     
@@ -303,23 +359,8 @@ TEAMS_CAPTION_OBSERVER_JS = """
         }
         
         // Must NOT contain common speech words
-        const lower = trimmed.toLowerCase();
-        const speechWords = [
-            'yes', 'no', 'ok', 'okay', 'sure', 'so', 'can', 'you', 'please',
-            'the', 'and', 'is', 'are', 'was', 'were', 'have', 'has', 'had',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must',
-            'what', 'why', 'how', 'when', 'where', 'who', 'which',
-            'this', 'that', 'these', 'those', 'here', 'there',
-            'not', 'but', 'for', 'with', 'from', 'about', 'into',
-            'your', 'my', 'his', 'her', 'its', 'our', 'their',
-            'just', 'like', 'know', 'think', 'want', 'need', 'get',
-            'let', 'see', 'say', 'tell', 'ask', 'make', 'take',
-            'mute', 'unmute', 'leave', 'share', 'camera', 'call',
-            'meeting', 'captions', 'joined', 'left', 'unknown'
-        ];
-        
         for (const word of words) {
-            if (speechWords.includes(word.toLowerCase())) return false;
+            if (SPEECH_WORDS.has(word.toLowerCase())) return false;
         }
         
         return true;
@@ -329,27 +370,26 @@ TEAMS_CAPTION_OBSERVER_JS = """
         if (!text || text.length < 3) return;
         
         // Skip UI/system text
-        const lower = text.toLowerCase();
-        if (lower.includes('turn on') || lower.includes('live captions') || 
-            lower.includes('captions are turned on') || lower.includes('joined the') ||
-            lower.includes('left the') || lower.includes('unknown user')) {
-            return;
-        }
+        if (SYSTEM_TEXT_RE.test(text)) return;
         
         // Dedupe
         if (emittedSet.has(text)) return;
         emittedSet.add(text);
         
         captionCount++;
-        console.log("[#" + captionCount + "] " + speaker + ": " + text);
         
-        if (window.screenAppTranscript) {
-            window.screenAppTranscript({
-                speaker: speaker,
-                text: text,
-                timestamp: new Date().toISOString()
-            });
-        }
+        // Timestamp now; delivery is batched
+        pendingTranscripts.push({
+            speaker: speaker,
+            text: text,
+            timestamp: new Date().toISOString()
+        });
+        if (pendingTranscripts.length >= MAX_BATCH_SIZE) flushTranscripts();
+    }
+    
+    function flushTranscripts() {
+        if (!pendingTranscripts.length || !window.screenAppTranscriptBatch) return;
+        window.screenAppTranscriptBatch(pendingTranscripts.splice(0));
     }
     
     function isCompleteSentence(text) {
@@ -468,6 +508,9 @@ TEAMS_CAPTION_OBSERVER_JS = """
     }
     
     function scanCaptions() {
+        // Nothing to deliver captions to until transcription has started
+        if (!window.screenAppTranscriptBatch) return;
+        
         // PRIMARY METHOD: Use Teams' actual DOM structure
         // Find all caption text elements with data-tid="closed-caption-text"
         const captionTextElements = document.querySelectorAll('[data-tid="closed-caption-text"]');
@@ -549,22 +592,99 @@ TEAMS_CAPTION_OBSERVER_JS = """
         scanCaptions();
     });
     
-    observer.observe(document.body, {
-        childList: true,
-        subtree: true,
-        characterData: true
-    });
-    
-    // Poll
-    setInterval(scanCaptions, 400);
-    
-    // Initial
-    setTimeout(scanCaptions, 500);
+    const start = () => {
+        observer.observe(document.body, {
+            childList: true,
+            subtree: true,
+            characterData: true
+        });
+        
+        // Poll
+        setInterval(scanCaptions, 400);
+        
+        // Deliver buffered captions
+        setInterval(flushTranscripts, FLUSH_INTERVAL_MS);
+        
+        // Initial
+        setTimeout(scanCaptions, 500);
+    };
+    
+    // Init scripts run before <body> exists
+    if (document.body) {
+        start();
+    } else {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    }
     
     console.log("Teams Caption Observer V10 Ready - Using data-tid selectors");
 })();
 """
 
+# JavaScript to switch camera and mic off on the pre-join screen in one round-trip
+# One querySelectorAll over a precompiled selector; the first switch found per
+# device wins. Returns {camera, mic}, each 'clicked' | 'already_off' | 'not_found'
+TEAMS_MUTE_BEFORE_JOIN_JS = """
+() => {
+    const SWITCH_SELECTOR = [
+        '[data-tid="toggle-video"]',
+        'input[data-tid="toggle-mute"]',
+        '[role="switch"][aria-label*="camera" i]',
+        '[role="switch"][aria-label*="microphone" i]',
+    ].join(', ');
+    const CAMERA_RE = /toggle-video|camera|video/i;
+
+    const result = { camera: 'not_found', mic: 'not_found' };
+    for (const el of document.querySelectorAll(SWITCH_SELECTOR)) {
+        const label = (el.getAttribute('data-tid') || '') + ' ' + (el.getAttribute('aria-label') || '');
+        const device = CAMERA_RE.test(label) ? 'camera' : 'mic';
+        if (result[device] !== 'not_found') continue;
+
+        const isOn = el.checked !== undefined ? el.checked : el.getAttribute('aria-checked') === 'true';
+        if (isOn) {
+            el.click();
+            result[device] = 'clicked';
+        } else {
+            result[device] = 'already_off';
+        }
+        if (result.camera !== 'not_found' && result.mic !== 'not_found') break;
+    }
+    return result;
+}
+"""
+
+# JavaScript to click the captions item in the open "More actions" menu.
+# Returns {success, found}; found is the clicked item's text
+TEAMS_CLICK_CAPTIONS_MENU_ITEM_JS = """
+() => {
+    // Search the open menu first; only fall back to every
+    // button on the page if the menu has no caption item
+    const menu = document.querySelector('[role="menu"]');
+    const scopes = menu ? [menu, document] : [document];
+
+    for (const scope of scopes) {
+        const elements = scope.querySelectorAll('[role="menuitem"], [role="menuitemcheckbox"], button');
+
+        for (const el of elements) {
+            // aria-label is a cheap attribute read; textContent walks the subtree
+            const label = (el.getAttribute('aria-label') || '').toLowerCase();
+            if (label.includes('turn off')) continue;
+            const text = (el.textContent || '').toLowerCase();
+
+            if ((text.includes('caption') || label.includes('caption')) && 
+                !text.includes('turn off')) {
+
+                const rect = el.getBoundingClientRect();
+                if (rect.width > 0 && rect.height > 0) {
+                    el.click();
+                    return {success: true, found: el.textContent};
+                }
+            }
+        }
+    }
+    return {success: false};
+}
+"""
+
 # JavaScript to check if captions are enabled
 TEAMS_CHECK_CAPTIONS_JS = """
 (() => {
@@ -590,22 +710,203 @@ TEAMS_CHECK_CAPTIONS_JS = """
 })();
 """
 
+# In-page matchers for the admission watcher, built once at import
+_TEAMS_ADMISSION_GROUPS = {
+    "prompt": to_dom_matcher(['button:has-text("Continue without")']),
+    # Leave button or participant list both mean we're in the meeting
+    "admitted": to_dom_matcher(
+        [*TEAMS_SELECTORS["leave_button"], '[data-tid="roster-list"]', '#roster-list']
+    ),
+    "denied": to_dom_matcher(TEAMS_SELECTORS["entry_denied"]),
+    "lobby": to_dom_matcher(TEAMS_SELECTORS["waiting_lobby"]),
+}
+
+# Init script defining window.__teamsAdmissionWatch(timeoutMs): a push-based
+# wait for the admission outcome. Resolves with "prompt", "admitted" or
+# "denied" as soon as one is visible; otherwise with "lobby" or "waiting"
+# after timeoutMs so the caller can log progress and re-arm. Installed once
+# per page so each re-arm only sends TEAMS_ADMISSION_WATCH_CALL_JS.
+TEAMS_ADMISSION_WATCH_INIT_JS = (
+    "(() => {\n"
+    + "    const groups = " + json.dumps(_TEAMS_ADMISSION_GROUPS) + ";\n"
+    + DOM_MATCHER_JS
+    + """
+    const check = () => {
+        for (const state of ['prompt', 'admitted', 'denied']) {
+            if (matches(groups[state])) return state;
+        }
+        return null;
+    };
+    
+    window.__teamsAdmissionWatch = async (timeoutMs) => {
+        const initial = check();
+        if (initial) return initial;
+        
+        return await new Promise((resolve) => {
+            let done = false;
+            let scheduled = false;
+            const finish = (state) => {
+                if (done) return;
+                done = true;
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(state);
+            };
+            // Teams mutates constantly; coalesce bursts into one check per 100ms
+            const observer = new MutationObserver(() => {
+                if (scheduled) return;
+                scheduled = true;
+                setTimeout(() => {
+                    scheduled = false;
+                    const state = check();
+                    if (state) finish(state);
+                }, 100);
+            });
+            observer.observe(document.body, {
+                childList: true,
+                subtree: true,
+                attributes: true,
+                attributeFilter: ['aria-hidden', 'style', 'class', 'hidden']
+            });
+            const timer = setTimeout(() => finish(matches(groups.lobby) ? 'lobby' : 'waiting'), timeoutMs);
+        });
+    };
+})();
+""")
+
+TEAMS_ADMISSION_WATCH_CALL_JS = "(timeoutMs) => window.__teamsAdmissionWatch(timeoutMs)"
+
+
+# In-meeting state read by the monitor on every tick: [denied, leave]
+_TEAMS_MEETING_STATE_GROUPS = {
+    "denied": to_dom_matcher(TEAMS_SELECTORS["entry_denied"]),
+    "leave": to_dom_matcher(TEAMS_SELECTORS["leave_button"]),
+    "captions": to_dom_matcher(TEAMS_SELECTORS["caption_container"]),
+}
+
+# Init script defining window.__teamsMeetingState(). A MutationObserver only
+# marks the state dirty; the selector sweep runs on the next read, and is
+# skipped entirely when the DOM has not changed since the previous tick.
+# The same observer reports caption loss: once captions have been seen, a
+# missing caption container calls window.screenAppCaptionLost() (at most
+# once a minute while they stay off), so Python re-enables them on demand.
+# It also calls window.screenAppMeetingStateChanged() when a CSS-only probe
+# of the leave button (and the CSS part of denied) changes, so the monitor
+# sleeps until there is something to check. The text-walking sweep only runs
+# when Python then reads __teamsMeetingState().
+TEAMS_MEETING_STATE_INIT_JS = (
+    "(() => {\n"
+    + "    const groups = " + json.dumps(_TEAMS_MEETING_STATE_GROUPS) + ";\n"
+    + DOM_MATCHER_JS
+    + """
+    const CAPTION_CHECK_MS = 1000;
+    const CAPTION_LOST_RETRY_MS = 60000;
+    const STATE_CHECK_MS = 1000;
+    
+    let dirty = true;
+    let last = null;
+    let captionsSeen = false;
+    let captionCheckScheduled = false;
+    let lastLostAt = 0;
+    let stateCheckScheduled = false;
+    let reported = null;
+    
+    // Teams mutates constantly, so the per-second probe skips the text walkers
+    const cssOnly = ({ css }) => ({ css, texts: [] });
+    const quickGroups = [cssOnly(groups.denied), cssOnly(groups.leave)];
+    
+    const checkState = () => {
+        stateCheckScheduled = false;
+        if (!document.body) return;
+        const key = quickGroups.map((group) => matches(group)).join();
+        if (key !== reported) {
+            reported = key;
+            window.screenAppMeetingStateChanged();
+        }
+    };
+    
+    const checkCaptions = () => {
+        captionCheckScheduled = false;
+        if (matches(groups.captions)) {
+            captionsSeen = true;
+        } else if (captionsSeen && Date.now() - lastLostAt >= CAPTION_LOST_RETRY_MS) {
+            lastLostAt = Date.now();
+            window.screenAppCaptionLost();
+        }
+    };
+    
+    const observer = new MutationObserver(() => {
+        dirty = true;
+        // Each check is only armed once Python has exposed its callback
+        if (!stateCheckScheduled && window.screenAppMeetingStateChanged) {
+            stateCheckScheduled = true;
+            setTimeout(checkState, STATE_CHECK_MS);
+        }
+        if (captionCheckScheduled || !window.screenAppCaptionLost) return;
+        captionCheckScheduled = true;
+        setTimeout(checkCaptions, CAPTION_CHECK_MS);
+    });
+    
+    const start = () => {
+        observer.observe(document.body, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            attributeFilter: ['aria-hidden', 'style', 'class', 'hidden']
+        });
+    };
+    
+    // Init scripts run before <body> exists
+    if (document.body) {
+        start();
+    } else {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    }
+    
+    window.__teamsMeetingState = () => {
+        if (!document.body) return null;
+        if (dirty || !last) {
+            dirty = false;
+            last = [matches(groups.denied), matches(groups.leave)];
+        }
+        return last;
+    };
+})();
+""")
+
+TEAMS_MEETING_STATE_CALL_JS = "() => window.__teamsMeetingState ? window.__teamsMeetingState() : null"
+
+
+# Every per-document Teams script in one bundle, registered with a single
+# add_init_script. Each part is a self-contained IIFE.
+TEAMS_PAGE_INIT_JS = "\n".join([
+    # Caption observer: idle until transcription exposes its callback
+    TEAMS_CAPTION_OBSERVER_JS,
+    # Admission watcher: compiled once per document; each re-arm is a tiny call
+    TEAMS_ADMISSION_WATCH_INIT_JS,
+    # In-meeting state read by the orchestrator's monitor loop
+    TEAMS_MEETING_STATE_INIT_JS,
+])
+
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-def get_selectors_for(element_type: str) -> list:
+@lru_cache(maxsize=None)
+def get_selectors_for(element_type: str) -> tuple[str, ...]:
     """
-    Get list of selectors for a specific element type.
+    Get selectors for a specific element type.
+    
+    Results are cached; polling loops call this on every tick.
     
     Args:
         element_type: Key from TEAMS_SELECTORS dict
         
     Returns:
-        List of CSS/text selectors to try
+        Tuple of CSS/text selectors to try
     """
-    return TEAMS_SELECTORS.get(element_type, [])
+    return tuple(TEAMS_SELECTORS.get(element_type, ()))
 
 
 def get_first_selector(element_type: str) -> str:
@@ -8,7 +8,7 @@ Handles all Zoom meeting operations including:
 
 from __future__ import annotations
 
-import asyncio
+import time
 import traceback
 from typing import Optional
 
@@ -16,20 +16,45 @@ from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
+    TimeoutError as PlaywrightTimeoutError,
 )
 
-from app.config import get_logger
+from app.config import settings, get_logger
 from app.models import MeetingDetails
+from .browser_utils import ContextPool, block_heavy_assets, release_meeting
 
 
 logger = get_logger("zoom_handler")
 
+# Any of these visible means the Zoom page is ready for the join flow:
+# launcher page, web client pre-join screen, or already in the meeting
+_ZOOM_READY_SELECTOR = ", ".join([
+    'button:has-text("Launch Meeting")',
+    'a:has-text("Join from Your Browser")',
+    'a:has-text("Join from your browser")',
+    'input#input-for-name',
+    'button:has-text("Join")',
+    'button[aria-label*="Leave"]',
+])
+
 
 class ZoomMeetingHandler:
     """Handler for Zoom meetings."""
     
     def __init__(self, browser: Browser):
         self.browser = browser
+        # Contexts are created ahead of joins; each meeting still gets its own
+        self._context_pool = ContextPool(
+            browser,
+            settings.bot.context_pool_size,
+            # Opt-in: blocked avatars, fonts and icons are missing from recordings
+            setup=block_heavy_assets if settings.bot.block_assets else None,
+            permissions=["microphone", "camera"],
+        )
+    
+    def warm_up(self) -> None:
+        """Start pre-creating browser contexts so the first join skips that cost."""
+        self._context_pool.refill()
     
     async def join_meeting(self, meeting: MeetingDetails, active_contexts: dict[str, BrowserContext]) -> None:
         """
@@ -40,20 +65,26 @@ class ZoomMeetingHandler:
         2. Wait for page to load
         3. Allow manual completion of join flow
         """
-        # Create isolated browser context for this meeting
-        context = await self.browser.new_context(permissions=["microphone", "camera"])
+        # Take a pre-created isolated browser context for this meeting
+        context = await self._context_pool.acquire()
         active_contexts[meeting.meeting_url] = context
         page = await context.new_page()
         
         try:
             # --- Step 1: Navigate to meeting URL ---
             logger.info(f"Navigating to Zoom meeting: {meeting.meeting_url}")
-            await page.goto(meeting.meeting_url, wait_until="load")
-            logger.info("Zoom meeting page loaded")
+            await page.goto(meeting.meeting_url, wait_until="domcontentloaded")
+            logger.info("Zoom meeting page DOM loaded")
             
             # --- Step 2: Wait for page stabilization ---
+            # Proceed as soon as the page is interactive; 30s is only the cap
             logger.info("Waiting for Zoom meeting page to stabilize...")
-            await asyncio.sleep(30)
+            started = time.monotonic()
+            try:
+                await page.wait_for_selector(_ZOOM_READY_SELECTOR, state="visible", timeout=30000)
+                logger.info(f"Zoom page ready after {(time.monotonic() - started) * 1000:.0f}ms")
+            except PlaywrightTimeoutError:
+                logger.warning("No Zoom join controls after 30s, continuing anyway")
             logger.info("Complete join flow in browser.")
             
             return context, page
@@ -62,7 +93,5 @@ class ZoomMeetingHandler:
             logger.error(f"Error during Zoom join flow: {e}")
             logger.error(traceback.format_exc())
             
-            await context.close()
-            if meeting.meeting_url in active_contexts:
-                del active_contexts[meeting.meeting_url]
+            await release_meeting(active_contexts, meeting.meeting_url, context)
             return None, None
@@ -13,6 +13,7 @@ from __future__ import annotations
 import asyncio
 import os
 import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -62,6 +63,9 @@ class PulseAudioCapture:
         self.state = "idle"  # idle, starting, recording, stopping, stopped, error
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        # Monotonic clock readings for duration; wall-clock times are for export only
+        self._started_monotonic: Optional[float] = None
+        self._stopped_monotonic: Optional[float] = None
         self.audio_path: Optional[Path] = None
         
         # PulseAudio source (can be overridden via environment)
@@ -140,6 +144,8 @@ class PulseAudioCapture:
         
         # Record start time BEFORE spawning (for accurate sync)
         self.start_time = datetime.now()
+        self._started_monotonic = time.monotonic()
+        self._stopped_monotonic = None
         
         try:
             self.ffmpeg_process = await asyncio.create_subprocess_exec(
@@ -187,7 +193,7 @@ class PulseAudioCapture:
         logger.info("Stopping PulseAudio audio capture...")
         
         if not self.ffmpeg_process:
-            self.end_time = datetime.now()
+            self._mark_stopped()
             self.state = "stopped"
             return self._build_result(success=False, error="No FFmpeg process found")
         
@@ -205,7 +211,7 @@ class PulseAudioCapture:
                 self.ffmpeg_process.kill()
                 await self.ffmpeg_process.wait()
             
-            self.end_time = datetime.now()
+            self._mark_stopped()
             self.state = "stopped"
             
             result = self._build_result(success=True)
@@ -214,10 +220,15 @@ class PulseAudioCapture:
             
         except Exception as e:
             logger.error(f"Error stopping FFmpeg: {e}")
-            self.end_time = datetime.now()
+            self._mark_stopped()
             self.state = "error"
             return self._build_result(success=False, error=str(e))
     
+    def _mark_stopped(self) -> None:
+        """Record when capture ended (wall clock for export, monotonic for duration)."""
+        self.end_time = datetime.now()
+        self._stopped_monotonic = time.monotonic()
+    
     def is_recording(self) -> bool:
         """Check if currently recording."""
         return self.state == "recording"
@@ -270,12 +281,12 @@ class PulseAudioCapture:
         if self.audio_path and self.audio_path.exists():
             try:
                 file_size = self.audio_path.stat().st_size
-            except:
+            except OSError:
                 pass
         
         duration = 0.0
-        if self.start_time and self.end_time:
-            duration = (self.end_time - self.start_time).total_seconds()
+        if self._started_monotonic is not None and self._stopped_monotonic is not None:
+            duration = self._stopped_monotonic - self._started_monotonic
         
         return {
             "audio_path": str(self.audio_path) if self.audio_path else "",
@@ -19,6 +19,7 @@ import asyncio
 import base64
 import json
 import shutil
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -35,6 +36,155 @@ from .pulse_audio_capture import PulseAudioCapture
 logger = get_logger("recording")
 
 
+# Captures page audio without user interaction; injected by _inject_audio_recorder
+AUDIO_RECORDER_JS = """
+async () => {
+    console.log("🎤 Initializing Audio Recorder...");
+
+    // Check if already recording
+    if (window.audioRecorder) {
+        console.log("Audio recorder already initialized");
+        return { success: true, message: "Already initialized" };
+    }
+
+    try {
+        // Create a silent audio context to capture page audio
+        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+
+        // Create a MediaStreamDestination to capture audio
+        const destination = audioContext.createMediaStreamDestination();
+
+        // Try to find and capture audio from video elements on the page
+        const videoElements = document.querySelectorAll('video, audio');
+        console.log(`Found ${videoElements.length} media elements`);
+
+        let audioSourceConnected = false;
+
+        for (const mediaEl of videoElements) {
+            try {
+                if (mediaEl.srcObject) {
+                    const source = audioContext.createMediaStreamSource(mediaEl.srcObject);
+                    source.connect(destination);
+                    audioSourceConnected = true;
+                    console.log("✅ Connected audio from media element");
+                }
+            } catch (e) {
+                console.log("Could not connect media element:", e.message);
+            }
+        }
+
+        // If no video elements, create a silent source (fallback)
+        if (!audioSourceConnected) {
+            console.log("No media elements found, will monitor for them...");
+
+            // Monitor for new video elements
+            const observer = new MutationObserver((mutations) => {
+                const videos = document.querySelectorAll('video, audio');
+                videos.forEach(mediaEl => {
+                    if (mediaEl.srcObject && !mediaEl.dataset.audioConnected) {
+                        try {
+                            const source = audioContext.createMediaStreamSource(mediaEl.srcObject);
+                            source.connect(destination);
+                            mediaEl.dataset.audioConnected = 'true';
+                            console.log("✅ Connected new audio source");
+                        } catch (e) {
+                            console.log("Error connecting audio:", e.message);
+                        }
+                    }
+                });
+            });
+
+            observer.observe(document.body, { childList: true, subtree: true });
+            window.audioMutationObserver = observer;
+        }
+
+        // Create MediaRecorder for audio
+        const mimeType = MediaRecorder.isTypeSupported('audio/webm;codecs=opus') 
+            ? 'audio/webm;codecs=opus' 
+            : 'audio/webm';
+
+        const recorder = new MediaRecorder(destination.stream, {
+            mimeType: mimeType,
+            audioBitsPerSecond: 192000
+        });
+
+        // Handle recorded chunks
+        recorder.ondataavailable = async (event) => {
+            if (event.data && event.data.size > 0) {
+                const arrayBuffer = await event.data.arrayBuffer();
+                const base64 = btoa(String.fromCharCode(...new Uint8Array(arrayBuffer)));
+                await window.sendAudioChunk({
+                    data: base64,
+                    size: event.data.size,
+                    timestamp: Date.now()
+                });
+            }
+        };
+
+        recorder.onerror = (event) => {
+            console.error("Audio recorder error:", event.error);
+        };
+
+        // Start recording with 5-second chunks
+        recorder.start(5000);
+
+        // Record audio start timestamp for synchronization
+        window.audioStartTimestamp = Date.now();
+        console.log("✅ Audio recording started at timestamp:", window.audioStartTimestamp);
+
+        // Store globally
+        window.audioRecorder = recorder;
+        window.audioContext = audioContext;
+
+        // Stop function
+        window.stopAudioRecording = () => {
+            console.log("⏹️ Stopping audio recording...");
+            if (recorder && recorder.state !== 'inactive') {
+                recorder.stop();
+            }
+            if (window.audioMutationObserver) {
+                window.audioMutationObserver.disconnect();
+            }
+            if (audioContext) {
+                audioContext.close();
+            }
+            console.log("✅ Audio recording stopped");
+        };
+
+        return { success: true, mimeType };
+
+    } catch (error) {
+        console.error("Audio recording initialization error:", error);
+        return { success: false, error: error.message };
+    }
+}
+"""
+
+
+async def _run_ffmpeg(cmd: List[str]) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg command without blocking the event loop.
+    
+    Encoding a long meeting takes a while; a blocking subprocess.run here would
+    stall Playwright traffic for every other meeting in the meantime.
+    
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
 class RecordingService:
     """Manages video recording for meetings using Playwright's native recording."""
     
@@ -65,6 +215,7 @@ class RecordingService:
         
         # Recording metadata
         self.recording_started_at: Optional[datetime] = None
+        self._recording_started_monotonic: Optional[float] = None  # for duration math
         self.video_file_path: Optional[Path] = None
         self.audio_file_path: Optional[Path] = None
         self.recording_dir: Optional[Path] = None
@@ -119,6 +270,7 @@ class RecordingService:
             self.meeting_details = meeting
             self.recording_id = f"{meeting.meeting_id or uuid.uuid4()}_{int(datetime.now().timestamp())}"
             self.recording_started_at = datetime.now()
+            self._recording_started_monotonic = time.monotonic()
             
             # Create recording directory
             self.recording_dir = self.recordings_base_dir / self.recording_id
@@ -190,130 +342,7 @@ class RecordingService:
     async def _inject_audio_recorder(self) -> bool:
         """Inject JavaScript to capture page audio without user interaction."""
         try:
-            audio_script = """
-            async () => {
-                console.log("🎤 Initializing Audio Recorder...");
-                
-                // Check if already recording
-                if (window.audioRecorder) {
-                    console.log("Audio recorder already initialized");
-                    return { success: true, message: "Already initialized" };
-                }
-                
-                try {
-                    // Create a silent audio context to capture page audio
-                    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
-                    
-                    // Create a MediaStreamDestination to capture audio
-                    const destination = audioContext.createMediaStreamDestination();
-                    
-                    // Try to find and capture audio from video elements on the page
-                    const videoElements = document.querySelectorAll('video, audio');
-                    console.log(`Found ${videoElements.length} media elements`);
-                    
-                    let audioSourceConnected = false;
-                    
-                    for (const mediaEl of videoElements) {
-                        try {
-                            if (mediaEl.srcObject) {
-                                const source = audioContext.createMediaStreamSource(mediaEl.srcObject);
-                                source.connect(destination);
-                                audioSourceConnected = true;
-                                console.log("✅ Connected audio from media element");
-                            }
-                        } catch (e) {
-                            console.log("Could not connect media element:", e.message);
-                        }
-                    }
-                    
-                    // If no video elements, create a silent source (fallback)
-                    if (!audioSourceConnected) {
-                        console.log("No media elements found, will monitor for them...");
-                        
-                        // Monitor for new video elements
-                        const observer = new MutationObserver((mutations) => {
-                            const videos = document.querySelectorAll('video, audio');
-                            videos.forEach(mediaEl => {
-                                if (mediaEl.srcObject && !mediaEl.dataset.audioConnected) {
-                                    try {
-                                        const source = audioContext.createMediaStreamSource(mediaEl.srcObject);
-                                        source.connect(destination);
-                                        mediaEl.dataset.audioConnected = 'true';
-                                        console.log("✅ Connected new audio source");
-                                    } catch (e) {
-                                        console.log("Error connecting audio:", e.message);
-                                    }
-                                }
-                            });
-                        });
-                        
-                        observer.observe(document.body, { childList: true, subtree: true });
-                        window.audioMutationObserver = observer;
-                    }
-                    
-                    // Create MediaRecorder for audio
-                    const mimeType = MediaRecorder.isTypeSupported('audio/webm;codecs=opus') 
-                        ? 'audio/webm;codecs=opus' 
-                        : 'audio/webm';
-                    
-                    const recorder = new MediaRecorder(destination.stream, {
-                        mimeType: mimeType,
-                        audioBitsPerSecond: 192000
-                    });
-                    
-                    // Handle recorded chunks
-                    recorder.ondataavailable = async (event) => {
-                        if (event.data && event.data.size > 0) {
-                            const arrayBuffer = await event.data.arrayBuffer();
-                            const base64 = btoa(String.fromCharCode(...new Uint8Array(arrayBuffer)));
-                            await window.sendAudioChunk({
-                                data: base64,
-                                size: event.data.size,
-                                timestamp: Date.now()
-                            });
-                        }
-                    };
-                    
-                    recorder.onerror = (event) => {
-                        console.error("Audio recorder error:", event.error);
-                    };
-                    
-                    // Start recording with 5-second chunks
-                    recorder.start(5000);
-                    
-                    // Record audio start timestamp for synchronization
-                    window.audioStartTimestamp = Date.now();
-                    console.log("✅ Audio recording started at timestamp:", window.audioStartTimestamp);
-                    
-                    // Store globally
-                    window.audioRecorder = recorder;
-                    window.audioContext = audioContext;
-                    
-                    // Stop function
-                    window.stopAudioRecording = () => {
-                        console.log("⏹️ Stopping audio recording...");
-                        if (recorder && recorder.state !== 'inactive') {
-                            recorder.stop();
-                        }
-                        if (window.audioMutationObserver) {
-                            window.audioMutationObserver.disconnect();
-                        }
-                        if (audioContext) {
-                            audioContext.close();
-                        }
-                        console.log("✅ Audio recording stopped");
-                    };
-                    
-                    return { success: true, mimeType };
-                    
-                } catch (error) {
-                    console.error("Audio recording initialization error:", error);
-                    return { success: false, error: error.message };
-                }
-            }
-            """
-            
-            result = await self.page.evaluate(audio_script)
+            result = await self.page.evaluate(AUDIO_RECORDER_JS)
             
             if result.get("success"):
                 logger.info(f"Audio recorder injected successfully. MIME: {result.get('mimeType')}")
@@ -389,18 +418,9 @@ class RecordingService:
                         else:
                             logger.warning(f"Video path exists but file not found: {video_path}")
                 except Exception as e:
-                    logger.warning(f"Error getting video path: {e}")
-                    # Try to find any video files in the temp directory
-                    try:
-                        temp_dir = self.temp_recordings_dir
-                        if temp_dir.exists():
-                            video_files = list(temp_dir.glob("*.webm"))
-                            if video_files:
-                                latest_video = max(video_files, key=lambda x: x.stat().st_mtime)
-                                shutil.move(str(latest_video), str(self.video_file_path))
-                                logger.info(f"Found and moved video from temp dir: {self.video_file_path}")
-                    except Exception as move_error:
-                        logger.warning(f"Could not recover video from temp dir: {move_error}")
+                    # No guessing from the shared temp dir: the newest file there
+                    # may belong to another meeting recording in the same context
+                    logger.warning(f"Error getting video path, video not saved: {e}")
             
             # Give time for final audio chunks
             await asyncio.sleep(2)
@@ -424,7 +444,7 @@ class RecordingService:
         try:
             chunk_data = base64.b64decode(data["data"])
             self.audio_chunks.append(chunk_data)
-            logger.debug(f"Audio chunk received: {data['size']} bytes (total chunks: {len(self.audio_chunks)})")
+            logger.debug("Audio chunk received: %s bytes (total chunks: %d)", data['size'], len(self.audio_chunks))
         except Exception as e:
             logger.error(f"Error handling audio chunk: {e}")
     
@@ -449,7 +469,7 @@ class RecordingService:
                 "-y"  # Overwrite output file
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = await _run_ffmpeg(cmd)
             
             if result.returncode == 0:
                 logger.info(f"✅ Audio extracted to: {self.audio_file_path}")
@@ -469,12 +489,17 @@ class RecordingService:
     async def _finalize_recordings(self) -> Dict[str, Any]:
         """Finalize recording files and upload to S3 if configured."""
         try:
+            ended_at = datetime.now()
+            duration_seconds = (
+                time.monotonic() - self._recording_started_monotonic
+                if self._recording_started_monotonic is not None else 0
+            )
             recording_info = {
                 "recording_id": self.recording_id,
                 "meeting_title": self.meeting_details.title if self.meeting_details else "Unknown",
                 "started_at": self.recording_started_at.isoformat() if self.recording_started_at else None,
-                "ended_at": datetime.now().isoformat(),
-                "duration_seconds": (datetime.now() - self.recording_started_at).total_seconds() if self.recording_started_at else 0,
+                "ended_at": ended_at.isoformat(),
+                "duration_seconds": duration_seconds,
                 "files": {}
             }
             
@@ -570,7 +595,7 @@ class RecordingService:
                     ])
                     
                     logger.info(f"FFmpeg command: {' '.join(cmd)}")
-                    result = subprocess.run(cmd, capture_output=True, text=True)
+                    result = await _run_ffmpeg(cmd)
                     
                     if result.returncode == 0:
                         file_size_mb = self.video_file_path.stat().st_size / (1024 * 1024)
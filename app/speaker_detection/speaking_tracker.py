@@ -62,6 +62,23 @@ TEAMS_SELECTORS = {
     ],
 }
 
+# Names (data-tid) of video tiles that currently show a speaking outline.
+# One evaluate per poll instead of a query plus two round trips per indicator.
+SPEAKING_TILE_NAMES_JS = """
+() => {
+    const names = [];
+    const indicators = document.querySelectorAll(
+        '[data-tid="voice-level-stream-outline"].vdi-frame-occlusion'
+    );
+    for (const indicator of indicators) {
+        const tile = indicator.closest('[data-stream-type="Video"][data-tid]');
+        const name = tile && tile.getAttribute("data-tid");
+        if (name && name.trim()) names.push(name.trim());
+    }
+    return names;
+}
+"""
+
 
 class SpeakingTracker:
     """
@@ -106,6 +123,9 @@ class SpeakingTracker:
         self._speaking_task: Optional[asyncio.Task] = None
         self._participant_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
+        
+        # Set when a speaking segment opens; wakes the idle cleanup loop
+        self._speaker_opened = asyncio.Event()
     
     async def start(self) -> None:
         """Start tracking speakers."""
@@ -193,7 +213,7 @@ class SpeakingTracker:
                 await self._detect_teams_speaker()
             except Exception as e:
                 if self.verbose_logging:
-                    logger.debug(f"Speaking poll error: {e}")
+                    logger.debug("Speaking poll error: %s", e)
             await asyncio.sleep(0.1)  # 100ms
     
     async def _participant_polling_loop(self) -> None:
@@ -203,12 +223,18 @@ class SpeakingTracker:
                 await self._scan_participants()
             except Exception as e:
                 if self.verbose_logging:
-                    logger.debug(f"Participant poll error: {e}")
+                    logger.debug("Participant poll error: %s", e)
             await asyncio.sleep(self.participant_poll_interval_ms / 1000)
     
     async def _segment_cleanup_loop(self) -> None:
         """Close speaking segments that have been inactive."""
         while self.is_running:
+            if not self.active_speakers:
+                # Nothing can expire until someone starts speaking
+                self._speaker_opened.clear()
+                await self._speaker_opened.wait()
+                continue
+            
             try:
                 now = int(time.time() * 1000)
                 to_close = []
@@ -222,7 +248,7 @@ class SpeakingTracker:
                     
             except Exception as e:
                 if self.verbose_logging:
-                    logger.debug(f"Segment cleanup error: {e}")
+                    logger.debug("Segment cleanup error: %s", e)
             await asyncio.sleep(0.5)  # 500ms
     
     # =========================================================================
@@ -232,45 +258,26 @@ class SpeakingTracker:
     async def _detect_teams_speaker(self) -> None:
         """Detect currently speaking participant in Teams."""
         try:
-            # Look for speaking indicators
-            speaking_indicators = await self.page.query_selector_all(
-                '[data-tid="voice-level-stream-outline"].vdi-frame-occlusion'
-            )
+            # Resolve speaking indicators to tile names in the page; this runs
+            # every 100ms, so keep it to a single round trip and no handles
+            display_names = await self.page.evaluate(SPEAKING_TILE_NAMES_JS)
             
-            for indicator in speaking_indicators:
-                try:
-                    # Find parent video tile
-                    video_tile = await indicator.evaluate_handle(
-                        '(el) => el.closest(\'[data-stream-type="Video"][data-tid]\')'
-                    )
-                    
-                    tile_element = video_tile.as_element()
-                    if not tile_element:
-                        continue
-                    
-                    display_name = await tile_element.get_attribute("data-tid")
-                    if not display_name or not display_name.strip():
-                        continue
-                    
-                    clean_name = self._clean_display_name(display_name.strip())
-                    participant_id = f"video-tile-{clean_name.replace(' ', '-').lower()}"
-                    
-                    if not self._is_valid_participant_id(participant_id):
-                        continue
-                    
-                    # Register and open speaking segment
-                    self._register_participant(participant_id, clean_name)
-                    self._open_speaking_segment(participant_id, clean_name, "high")
-                    
-                    return  # Only track one speaker at a time
-                    
-                except Exception as e:
-                    if self.verbose_logging:
-                        logger.debug(f"Error processing indicator: {e}")
+            for display_name in display_names:
+                clean_name = self._clean_display_name(display_name)
+                participant_id = f"video-tile-{clean_name.replace(' ', '-').lower()}"
+                
+                if not self._is_valid_participant_id(participant_id):
+                    continue
+                
+                # Register and open speaking segment
+                self._register_participant(participant_id, clean_name)
+                self._open_speaking_segment(participant_id, clean_name, "high")
+                
+                return  # Only track one speaker at a time
                         
         except Exception as e:
             if self.verbose_logging:
-                logger.debug(f"Teams speaker detection error: {e}")
+                logger.debug("Teams speaker detection error: %s", e)
     
     # =========================================================================
     # Participant Scanning
@@ -362,7 +369,7 @@ class SpeakingTracker:
                         
         except Exception as e:
             if self.verbose_logging:
-                logger.debug(f"Participant scan error: {e}")
+                logger.debug("Participant scan error: %s", e)
     
     async def _check_mute_status(self, tile: ElementHandle) -> bool:
         """Check if participant is muted by looking at mic icon SVG."""
@@ -379,7 +386,7 @@ class SpeakingTracker:
                 return false;
             }''')
             return bool(is_muted)
-        except:
+        except Exception:
             return False
     
     # =========================================================================
@@ -411,6 +418,7 @@ class SpeakingTracker:
             confidence=confidence,
         )
         self.active_speakers[participant_id] = session
+        self._speaker_opened.set()
         
         logger.info(f"🎤 {display_name} started speaking @ {meeting_time:.1f}s")
     
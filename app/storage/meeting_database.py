@@ -28,9 +28,10 @@ class MeetingDatabase:
     
     def _initialize_db(self):
         """Create an empty database file."""
+        now = datetime.now().isoformat()
         initial_data = {
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
+            "created_at": now,
+            "last_updated": now,
             "meetings": {}
         }
         with open(self.db_path, 'w', encoding='utf-8') as f:
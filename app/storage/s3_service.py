@@ -8,6 +8,12 @@ from botocore.exceptions import ClientError
 from datetime import datetime
 from app.config.logger import logger
 
+# Timestamp embedded in S3 object keys
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Shared encoder: json.dumps() builds a new JSONEncoder whenever options are passed
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
 
 class S3Service:
     """Handles uploading meeting data to AWS S3."""
@@ -93,18 +99,18 @@ class S3Service:
             # Sanitize meeting ID for S3 key
             safe_meeting_id = self._sanitize_meeting_id(meeting_id)
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
             # New organized structure: {meeting_id}/json/
             s3_key = f"{safe_meeting_id}/json/transcript_{timestamp}.json"
             
-            # Convert dict to JSON string
-            json_content = json.dumps(meeting_data, indent=2, ensure_ascii=False)
+            # Convert dict to JSON bytes
+            json_content = _JSON_ENCODER.encode(meeting_data).encode('utf-8')
             
             # Upload to S3
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=json_content.encode('utf-8'),
+                Body=json_content,
                 ContentType='application/json',
                 Metadata={
                     'meeting_id': meeting_id,
@@ -149,18 +155,18 @@ class S3Service:
             # Sanitize meeting ID for S3 key
             safe_meeting_id = self._sanitize_meeting_id(meeting_id)
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
             # Store in same json directory as transcript
             s3_key = f"{safe_meeting_id}/json/speaking_{timestamp}.json"
             
-            # Convert dict to JSON string
-            json_content = json.dumps(speaking_data, indent=2, ensure_ascii=False)
+            # Convert dict to JSON bytes
+            json_content = _JSON_ENCODER.encode(speaking_data).encode('utf-8')
             
             # Upload to S3
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=json_content.encode('utf-8'),
+                Body=json_content,
                 ContentType='application/json',
                 Metadata={
                     'meeting_id': meeting_id,
@@ -214,7 +220,7 @@ class S3Service:
             safe_meeting_id = self._sanitize_meeting_id(meeting_id)
             
             # Generate S3 key (path) for the recording
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
             file_extension = file_path_obj.suffix
             
             # Determine directory based on recording type
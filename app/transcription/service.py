@@ -3,12 +3,16 @@ import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Set, Optional
+from threading import Lock
+from typing import Iterable, Set, Optional, Tuple
 
 from app.config import get_logger
 
 logger = get_logger("transcription_service")
 
+_FILE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_CAPTION_TIME_FORMAT = "%H:%M:%S"
+
 class TranscriptionService:
     """
     Handles saving meeting transcriptions to local files and exporting to JSON.
@@ -26,6 +30,8 @@ class TranscriptionService:
         self.meeting_end_time: Optional[datetime] = None
         self.participants: Set[str] = set()
         self.transcript_lines: list = []  # Store for JSON export
+        # Caption batches are written from a worker thread (append_transcripts)
+        self._lock = Lock()
 
     def start_transcription(self, meeting_id: str, meeting_details=None) -> None:
         """
@@ -41,7 +47,7 @@ class TranscriptionService:
         self.participants = set()
         self.transcript_lines = []
         
-        timestamp = self.meeting_start_time.strftime("%Y%m%d_%H%M%S")
+        timestamp = self.meeting_start_time.strftime(_FILE_TIMESTAMP_FORMAT)
         safe_id = "".join(c for c in meeting_id if c.isalnum() or c in ("-", "_"))
         filename = f"transcript_{safe_id}_{timestamp}.txt"
         self.current_file = self.output_dir / filename
@@ -57,16 +63,17 @@ class TranscriptionService:
         """Closes the current transcript file and records end time."""
         self.meeting_end_time = datetime.now()
         
-        if self._file_handle:
-            try:
-                self._write_line(f"--- Transcription ended at {self.meeting_end_time} ---")
-                self._file_handle.close()
-            except Exception as e:
-                logger.error(f"Error closing transcript file: {e}")
-            finally:
-                self._file_handle = None
-                logger.info(f"Stopped transcription: {self.current_file}")
-                # Don't reset metadata yet - we need it for JSON export
+        with self._lock:
+            if self._file_handle:
+                try:
+                    self._write_line(f"--- Transcription ended at {self.meeting_end_time} ---")
+                    self._file_handle.close()
+                except Exception as e:
+                    logger.error(f"Error closing transcript file: {e}")
+                finally:
+                    self._file_handle = None
+                    logger.info(f"Stopped transcription: {self.current_file}")
+                    # Don't reset metadata yet - we need it for JSON export
 
     def append_transcript(self, speaker: str, text: str, timestamp: str = None) -> None:
         """
@@ -77,9 +84,28 @@ class TranscriptionService:
             text: The transcribed text
             timestamp: Optional ISO timestamp from caption capture. If not provided, uses current time.
         """
-        if not self._file_handle:
-            return
+        with self._lock:
+            if self._file_handle:
+                self._write_line(self._record(speaker, text, timestamp))
+
+    def append_transcripts(self, entries: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """
+        Appends a batch of transcript lines with a single write and flush.
+        
+        Blocking file I/O; callers on the event loop run it via asyncio.to_thread.
+        
+        Args:
+            entries: (speaker, text, timestamp) tuples, in caption order
+        """
+        with self._lock:
+            if not self._file_handle:
+                return
+            lines = [self._record(speaker, text, timestamp) for speaker, text, timestamp in entries]
+            if lines:
+                self._write_line("\n".join(lines))
 
+    def _record(self, speaker: str, text: str, timestamp: Optional[str]) -> str:
+        """Track the speaker, store the line for JSON export and return its text form."""
         # Track unique participants
         if speaker and speaker.lower() not in ['system', 'unknown']:
             self.participants.add(speaker)
@@ -88,13 +114,12 @@ class TranscriptionService:
         if timestamp:
             try:
                 # Parse ISO timestamp and format as local time
-                from datetime import timezone
                 dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.astimezone().strftime("%H:%M:%S")
-            except:
-                time_str = datetime.now().strftime("%H:%M:%S")
+                time_str = dt.astimezone().strftime(_CAPTION_TIME_FORMAT)
+            except (ValueError, AttributeError):
+                time_str = datetime.now().strftime(_CAPTION_TIME_FORMAT)
         else:
-            time_str = datetime.now().strftime("%H:%M:%S")
+            time_str = datetime.now().strftime(_CAPTION_TIME_FORMAT)
         
         # Store for JSON export
         self.transcript_lines.append({
@@ -104,8 +129,7 @@ class TranscriptionService:
         })
         
         # Simple format: [Time] Speaker: Text
-        line = f"[{time_str}] {speaker}: {text}"
-        self._write_line(line)
+        return f"[{time_str}] {speaker}: {text}"
 
     def _write_line(self, line: str) -> None:
         if self._file_handle:
@@ -4,12 +4,14 @@ Simplified API - manual join only (no auth, no calendar polling).
 """
 
 import asyncio
+import json
 from contextlib import asynccontextmanager
 from typing import Optional
 from enum import Enum
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.bot import MeetingBot
 from app.config import settings, logger
@@ -148,56 +150,58 @@ app = FastAPI(
 
 # Request Models
 class ManualJoinRequest(BaseModel):
+    # Immutable and strict: unknown fields are rejected inside pydantic-core
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     bot_name: str = Field(..., json_schema_extra={"examples": ["Bot-01"]})
     meeting_url: str = Field(..., json_schema_extra={"examples": ["https://meet.google.com/abc-defg-hij"]})
     s3_bucket_name: Optional[str] = Field(
         default=None,
-        json_schema_extra={
-            "examples": ["my-meeting-transcripts"],
-            "description": "S3 bucket name. Uses env var AWS_S3_BUCKET_NAME if not provided."
-        }
+        description="S3 bucket name. Uses env var AWS_S3_BUCKET_NAME if not provided.",
+        json_schema_extra={"examples": ["my-meeting-transcripts"]}
     )
     aws_access_key_id: Optional[str] = Field(
         default=None,
-        json_schema_extra={
-            "description": "AWS access key. Uses env var AWS_ACCESS_KEY_ID if not provided."
-        }
+        description="AWS access key. Uses env var AWS_ACCESS_KEY_ID if not provided."
     )
     aws_secret_access_key: Optional[str] = Field(
         default=None,
-        json_schema_extra={
-            "description": "AWS secret key. Uses env var AWS_SECRET_ACCESS_KEY if not provided."
-        }
+        description="AWS secret key. Uses env var AWS_SECRET_ACCESS_KEY if not provided."
     )
     aws_region: Optional[str] = Field(
         default=None,
-        json_schema_extra={
-            "examples": ["us-east-1"],
-            "description": "AWS region. Defaults to 'us-east-1'."
-        }
+        description="AWS region. Defaults to 'us-east-1'.",
+        json_schema_extra={"examples": ["us-east-1"]}
     )
     caption_language: CaptionLanguage = Field(
         default=CaptionLanguage.ENGLISH,
-        json_schema_extra={
-            "description": "Caption language for transcription (89 languages supported)."
-        }
+        description="Caption language for transcription (89 languages supported)."
     )
 
 
+# ManualJoinRequest fields forwarded as-is to MeetingBot.manual_join_meeting
+_JOIN_FIELDS = frozenset({"bot_name", "meeting_url", "caption_language"})
+
+
 # --- API Endpoints ---
 
+# Static part of the health-check body, serialized once at import.
+# The trailing "}" is dropped so the live bot status can be appended.
+_ROOT_STATIC_PREFIX = json.dumps({
+    "status": "online",
+    "endpoints": {
+        "status": "GET /api/status",
+        "sessions": "GET /api/sessions",
+        "manual_join": "POST /api/join"
+    }
+}, separators=(",", ":")).encode()[:-1] + b',"bot_status":'
+
+
 @app.get("/", tags=["Status"], summary="Health Check")
 async def root():
     """Returns application health and status."""
-    return {
-        "status": "online",
-        "bot_status": bot.get_status(),
-        "endpoints": {
-            "status": "GET /api/status",
-            "sessions": "GET /api/sessions",
-            "manual_join": "POST /api/join"
-        }
-    }
+    body = _ROOT_STATIC_PREFIX + json.dumps(bot.get_status(), separators=(",", ":")).encode() + b"}"
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/api/status", tags=["Bot API"], summary="Get Bot Status")
@@ -215,14 +219,32 @@ async def manual_join(request: ManualJoinRequest):
     
     **Optional**: S3 credentials, caption_language
     """
+    # Already joining or in this meeting: answer without touching the browser
+    existing = bot.get_active_session(request.meeting_url)
+    if existing:
+        return {
+            "success": True,
+            "already_joined": True,
+            "meeting_id": existing.meeting.meeting_id,
+            "session_id": existing.session_id,
+            "platform": existing.meeting.platform.value
+        }
+    
+    # Custom S3 destination only when bucket, key and secret are all given;
+    # otherwise the orchestrator's env-configured S3 service is used
+    s3_config = None
+    if request.s3_bucket_name and request.aws_access_key_id and request.aws_secret_access_key:
+        s3_config = {
+            "bucket_name": request.s3_bucket_name,
+            "access_key_id": request.aws_access_key_id,
+            "secret_access_key": request.aws_secret_access_key,
+            "region": request.aws_region or "us-east-1"
+        }
+    
+    # mode="json" yields caption_language as its plain string value
     result = await bot.manual_join_meeting(
-        bot_name=request.bot_name,
-        meeting_url=request.meeting_url,
-        s3_bucket_name=request.s3_bucket_name,
-        aws_access_key_id=request.aws_access_key_id,
-        aws_secret_access_key=request.aws_secret_access_key,
-        aws_region=request.aws_region,
-        caption_language=request.caption_language.value
+        **request.model_dump(mode="json", include=_JOIN_FIELDS),
+        s3_config=s3_config
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Failed to join meeting"))